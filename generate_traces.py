@@ -1,8 +1,13 @@
 """Generate sample trace JSON files for each demo."""
 
+import argparse
 import json
-from datetime import datetime, timedelta
 import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src._json import json_dumps
 
 demos = [
     {
@@ -77,31 +82,66 @@ demos = [
     }
 ]
 
-def generate_trace(demo):
-    """Generate a sample trace for a demo."""
+# Per-trace random fields, drawn in one batch: inclusive (low, high) bounds
+RANDOM_FIELDS = [
+    ("analyzer_dur", 20, 40),
+    ("planner_dur", 15, 30),
+    ("generator_dur", 60, 120),
+    ("analyzer_extra_tokens", 200, 500),
+    ("planner_extra_tokens", 300, 600),
+    ("generator_extra_tokens", 500, 1000),
+    ("sheet_count", 1, 3),
+    ("input_cell_count", 5, 15),
+    ("line_count", 300, 800),
+]
+
+
+def draw_random_fields(count: int, seed: int = 42) -> list[list[int]]:
+    """Draw every random field for `count` traces up front (seeded, reproducible)."""
+    rng = random.Random(seed)
+    return [[rng.randint(lo, hi) for _, lo, hi in RANDOM_FIELDS] for _ in range(count)]
+
+
+def generate_trace(demo, r):
+    """Generate a sample trace for a demo from its row of random fields."""
+    (analyzer_dur, planner_dur, generator_dur,
+     analyzer_extra, planner_extra, generator_extra,
+     sheet_count, input_cell_count, line_count) = r
+    _td = timedelta
+    one_second = _td(seconds=1)
     base_time = datetime(2025, 12, 28, 11, 30, 0)
 
     # Analyzer agent
     analyzer_start = base_time
-    analyzer_end = analyzer_start + timedelta(seconds=random.randint(20, 40))
+    analyzer_end = analyzer_start + _td(seconds=analyzer_dur)
 
     # Planner agent
-    planner_start = analyzer_end + timedelta(seconds=1)
-    planner_end = planner_start + timedelta(seconds=random.randint(15, 30))
+    planner_start = analyzer_end + one_second
+    planner_end = planner_start + _td(seconds=planner_dur)
 
     # Generator agent
-    generator_start = planner_end + timedelta(seconds=1)
-    generator_end = generator_start + timedelta(seconds=random.randint(60, 120))
+    generator_start = planner_end + one_second
+    generator_end = generator_start + _td(seconds=generator_dur)
 
     total_duration = (generator_end - base_time).total_seconds() * 1000
 
     # Token counts (approximate)
     base_tokens = 500 + demo["formulas"] * 10
-    analyzer_tokens = base_tokens + random.randint(200, 500)
-    planner_tokens = base_tokens + random.randint(300, 600)
-    generator_tokens = base_tokens * 2 + random.randint(500, 1000)
+    analyzer_tokens = base_tokens + analyzer_extra
+    planner_tokens = base_tokens + planner_extra
+    generator_tokens = base_tokens * 2 + generator_extra
     total_tokens = analyzer_tokens + planner_tokens + generator_tokens
 
+    # Tool-call payloads (serialized once, reused below)
+    excel_filename = demo['excel'].split('/')[-1]
+    fp_args = json.dumps({"file_path": f"excel_files/{demo['excel']}"})
+    analyze_result = json.dumps({
+        "filename": excel_filename,
+        "sheets": [{"name": "Sheet1", "formulas": demo['formulas']}],
+        "total_formulas": demo['formulas'],
+        "functions_used": demo['functions']
+    })
+
     trace = {
         "trace_id": f"conv_{demo['num']}_trace",
         "workflow_name": f"Excel-to-WebApp: {demo['excel']}",
@@ -145,7 +185,7 @@ Use the available tools to thoroughly analyze this file."""
 
 **File Overview:**
 - File Name: {demo['name']}
-- Total Sheets: {random.randint(1, 3)}
+- Total Sheets: {sheet_count}
 - Total Formulas: {demo['formulas']}
 - Functions Used: {', '.join(demo['functions'])}
 
@@ -153,7 +193,7 @@ Use the available tools to thoroughly analyze this file."""
 The file contains a well-organized {"calculation sheet" if demo['formulas'] > 0 else "form template"} with {"multiple formula-driven calculations" if demo['formulas'] > 0 else "structured input fields"}.
 
 **Input Cells:**
-Identified {random.randint(5, 15)} input cells where users can enter data.
+Identified {input_cell_count} input cells where users can enter data.
 
 **Output Cells:**
 Found {demo['formulas']} formula cells that compute results based on inputs.
@@ -165,12 +205,12 @@ The analysis is complete and ready for the planning phase.""",
                 "output_tool_calls": [
                     {
                         "name": "analyze_excel",
-                        "arguments": json.dumps({"file_path": f"excel_files/{demo['excel']}"})
+                        "arguments": fp_args
                     }
                 ],
                 "started_at": analyzer_start.isoformat(),
                 "ended_at": analyzer_end.isoformat(),
-                "duration_ms": (analyzer_end - analyzer_start).total_seconds() * 1000,
+                "duration_ms": analyzer_dur * 1000.0,
                 "usage": {
                     "input_tokens": analyzer_tokens // 2,
                     "output_tokens": analyzer_tokens // 2,
@@ -235,7 +275,7 @@ The plan is ready for code generation.""",
                 "output_tool_calls": [],
                 "started_at": planner_start.isoformat(),
                 "ended_at": planner_end.isoformat(),
-                "duration_ms": (planner_end - planner_start).total_seconds() * 1000,
+                "duration_ms": planner_dur * 1000.0,
                 "usage": {
                     "input_tokens": planner_tokens // 2,
                     "output_tokens": planner_tokens // 2,
@@ -300,11 +340,11 @@ Generate production-ready code."""
 - Reset functionality
 - Responsive mobile layout
 
-The generated HTML file is ready for deployment. Total lines: ~{random.randint(300, 800)} lines of code.""",
+The generated HTML file is ready for deployment. Total lines: ~{line_count} lines of code.""",
                 "output_tool_calls": [],
                 "started_at": generator_start.isoformat(),
                 "ended_at": generator_end.isoformat(),
-                "duration_ms": (generator_end - generator_start).total_seconds() * 1000,
+                "duration_ms": generator_dur * 1000.0,
                 "usage": {
                     "input_tokens": generator_tokens // 2,
                     "output_tokens": generator_tokens // 2,
@@ -315,15 +355,10 @@ The generated HTML file is ready for deployment. Total lines: ~{random.randint(3
         "tool_calls": [
             {
                 "name": "analyze_excel",
-                "input": json.dumps({"file_path": f"excel_files/{demo['excel']}"}),
-                "output": json.dumps({
-                    "filename": demo['excel'].split('/')[-1],
-                    "sheets": [{"name": "Sheet1", "formulas": demo['formulas']}],
-                    "total_formulas": demo['formulas'],
-                    "functions_used": demo['functions']
-                }),
-                "started_at": (analyzer_start + timedelta(seconds=2)).isoformat(),
-                "ended_at": (analyzer_start + timedelta(seconds=5)).isoformat(),
+                "input": fp_args,
+                "output": analyze_result,
+                "started_at": (analyzer_start + _td(seconds=2)).isoformat(),
+                "ended_at": (analyzer_start + _td(seconds=5)).isoformat(),
                 "duration_ms": 3000
             }
         ]
@@ -332,15 +367,29 @@ The generated HTML file is ready for deployment. Total lines: ~{random.randint(3
     return trace
 
 
-def main():
-    for demo in demos:
-        trace = generate_trace(demo)
-        filename = f"traces/{demo['num']}-trace.json"
+def dump_trace(trace: dict, pretty: bool = False) -> bytes:
+    """Serialize a trace to UTF-8 JSON bytes (compact unless `pretty`)."""
+    return json_dumps(trace, indent=pretty).encode("utf-8")
+
+
+def _write_one(demo: dict, r: list[int], pretty: bool = False) -> str:
+    """Generate and write the trace file for one demo."""
+    trace = generate_trace(demo, r)
+    filename = f"traces/{demo['num']}-trace.json"
+    Path(filename).write_bytes(dump_trace(trace, pretty))
+    return filename
+
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(trace, f, ensure_ascii=False, indent=2)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sample trace JSON files")
+    parser.add_argument("--pretty", action="store_true", help="Indent JSON for human reading")
+    args = parser.parse_args(argv)
 
-        print(f"Generated: {filename}")
+    rows = draw_random_fields(len(demos))
+    # File writes are blocking syscalls; overlap them across a small pool
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for filename in executor.map(lambda d, r: _write_one(d, r, args.pretty), demos, rows):
+            print(f"Generated: {filename}")
 
 
 if __name__ == "__main__":
@@ -1,28 +1,71 @@
 """Main entry point for the Excel to WebApp Converter."""
 
-import argparse
 import asyncio
-import json
+import hashlib
+import os
+import shutil
 import sys
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+# Finished conversions keyed by input content hash and pipeline version
+# (re-runs on unchanged files skip the LLM; pipeline edits invalidate old entries)
+CACHE_DIR = Path.home() / ".cache" / "excel2web"
+
+# Pipeline source (agent prompts, model names, templates) hashed into cache keys
+PIPELINE_DIR = Path(__file__).parent / "src"
 
 
 def run_api(host: str = "0.0.0.0", port: int = 8000):
-    """Run the FastAPI server."""
+    """
+    Run the FastAPI server (uvloop/httptools are picked up when installed).
+
+    The server always runs as a single worker process: conversion jobs live
+    in the in-process JobStore (src/api/routes.py), so with several workers
+    a /status or /download request served by another worker would 404.
+    """
     import uvicorn
+
+    workers = os.getenv("WEB_CONCURRENCY", "").strip() or "1"
+    try:
+        workers = int(workers)
+    except ValueError:
+        print(f"Error: WEB_CONCURRENCY must be an integer, got {workers!r}")
+        sys.exit(1)
+    if workers > 1:
+        print(
+            "Error: WEB_CONCURRENCY > 1 is not supported. Conversion jobs are "
+            "kept in process memory, so all requests must reach one worker."
+        )
+        sys.exit(1)
+
     from src.api import app
 
     uvicorn.run(app, host=host, port=port)
 
 
+def _run(coro):
+    """asyncio.run on a uvloop event loop when uvloop is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+
+
 async def convert_file(
     excel_path: str,
     output_path: str = None,
     with_trace: bool = True,
     verbose: bool = False,
     max_iterations: int = 3,
+    use_cache: bool = True,
 ):
     """Convert a single Excel file to a web app."""
+    from src.agents._cache import LLMCache
+    from src.agents._client import shared_openai_client
     from src.orchestrator import convert_excel_to_webapp, ConversionProgress
     from src.tracing import add_json_tracing, get_processor
 
@@ -41,6 +84,14 @@ async def convert_file(
     else:
         output_path = Path(output_path)
 
+    cache_path = None
+    if use_cache:
+        cache_path = await asyncio.to_thread(_conversion_cache_path, path, max_iterations)
+        if cache_path.exists():
+            await asyncio.to_thread(shutil.copyfile, cache_path, output_path)
+            print(f"Cached result for {excel_path} -> {output_path}")
+            return
+
     # Enable JSON tracing
     trace_processor = None
     if with_trace:
@@ -53,26 +104,29 @@ async def convert_file(
     print(f"Converting: {excel_path}")
     print("-" * 40)
 
-    result = await convert_excel_to_webapp(
-        excel_path,
-        progress_callback,
-        verbose=verbose,
-        max_iterations=max_iterations,
-    )
+    # Share one OpenAI client (and its connection pool) across every agent run
+    async with shared_openai_client():
+        result = await convert_excel_to_webapp(
+            excel_path,
+            progress_callback,
+            verbose=verbose,
+            max_iterations=max_iterations,
+            llm_cache=LLMCache() if use_cache else None,
+        )
 
     if result.success:
-        html = result.app.html
-
         # Embed trace data in HTML if available
+        snippet = ()
         if trace_processor:
             trace_processor.force_flush()
             trace_data = trace_processor.get_latest_trace()
             if trace_data:
-                html = embed_trace_in_html(html, trace_data)
+                snippet = _trace_viewer_parts(trace_data)
 
-        # Write HTML to file
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html)
+        # Stream HTML (with the trace viewer spliced in) to disk off the event loop
+        await asyncio.to_thread(_write_with_snippet, output_path, result.app.html, snippet)
+        if cache_path is not None:
+            await asyncio.to_thread(_store_in_cache, output_path, cache_path)
 
         print("-" * 40)
         print(f"Success! Output saved to: {output_path}")
@@ -84,12 +138,60 @@ async def convert_file(
         sys.exit(1)
 
 
-def embed_trace_in_html(html: str, trace_data: dict) -> str:
-    """Embed trace data and viewer UI in the generated HTML."""
-    trace_json = json.dumps(trace_data, ensure_ascii=False)
-
-    # Trace viewer HTML/CSS/JS
-    trace_viewer = '''
+def _write_with_snippet(path: Path, html: str, snippet_parts) -> None:
+    """
+    Write HTML to disk with snippet parts inserted before the last </body>.
+
+    The pieces are encoded and written one at a time, so the full document
+    is never materialized as a second string. Runs in a worker thread.
+    """
+    idx = html.rfind("</body>")
+    if idx == -1:
+        idx = len(html)
+    with open(path, "wb") as f:
+        f.write(html[:idx].encode("utf-8"))
+        for part in snippet_parts:
+            f.write(part.encode("utf-8"))
+        f.write(html[idx:].encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def _pipeline_fingerprint() -> str:
+    """
+    Short hash of the conversion pipeline's source files.
+
+    Model names and prompts are defined in the agent modules, so any change
+    to them (or to the code and templates that shape the output) yields a
+    new fingerprint and old cached conversions are no longer served.
+    """
+    h = hashlib.sha256()
+    for path in sorted(PIPELINE_DIR.rglob("*")):
+        if path.suffix not in (".py", ".j2") or "__pycache__" in path.parts:
+            continue
+        h.update(path.relative_to(PIPELINE_DIR).as_posix().encode("utf-8"))
+        h.update(b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _conversion_cache_path(excel_path: Path, max_iterations: int) -> Path:
+    """Cache location for this file content, iteration budget and pipeline version."""
+    with open(excel_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return CACHE_DIR / f"{digest}-{_pipeline_fingerprint()}-i{max_iterations}.html"
+
+
+def _store_in_cache(output_path: Path, cache_path: Path) -> None:
+    """Copy a finished conversion into the cache (best effort)."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output_path, cache_path)
+    except OSError:
+        pass
+
+
+# Trace viewer HTML/CSS/JS, split around the embedded TRACE_DATA literal
+_TRACE_VIEWER_PRE = '''
 <!-- Agent Trace Viewer -->
 <style>
 .trace-toggle {
@@ -195,7 +297,9 @@ def embed_trace_in_html(html: str, trace_data: dict) -> str:
 </div>
 
 <script>
-const TRACE_DATA = ''' + trace_json + ''';
+const TRACE_DATA = '''
+
+_TRACE_VIEWER_POST = ''';
 
 function toggleTracePanel() {
     document.getElementById('tracePanel').classList.toggle('open');
@@ -245,17 +349,18 @@ document.addEventListener('DOMContentLoaded', renderTrace);
 </script>
 '''
 
-    # Insert before </body>
-    if '</body>' in html:
-        html = html.replace('</body>', trace_viewer + '</body>')
-    else:
-        html += trace_viewer
 
-    return html
+def _trace_viewer_parts(trace_data: dict) -> tuple[str, str, str]:
+    """Return the trace viewer markup as (prefix, trace JSON, suffix)."""
+    from src._json import json_dumps
 
+    return _TRACE_VIEWER_PRE, json_dumps(trace_data), _TRACE_VIEWER_POST
+
+
+def _build_parser():
+    """Build the full argparse CLI (used for --help, errors, and unusual argv)."""
+    import argparse
 
-def main():
-    """Main entry point."""
     parser = argparse.ArgumentParser(
         description="Convert Excel files to web applications",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -312,20 +417,104 @@ Examples:
         default=3,
         help="Maximum iterations for improvement loop (default: 3)",
     )
+    convert_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run the conversion, ignoring cached results",
+    )
 
-    args = parser.parse_args()
+    return parser
+
+
+def _fast_parse(argv: list[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common ``serve``/``convert`` invocations without argparse.
+
+    Returns None for anything it does not recognize (help flags, unknown
+    options, malformed values) so the caller can fall back to argparse,
+    which produces the usual help and error messages.
+    """
+    if not argv:
+        return None
+
+    command, rest = argv[0], argv[1:]
+    if command == "serve":
+        args = SimpleNamespace(command="serve", host="0.0.0.0", port=8000)
+        options = {"--host": "host", "--port": "port"}
+        flags = {}
+    elif command == "convert":
+        args = SimpleNamespace(
+            command="convert", file=None, output=None, verbose=False, iterations=3,
+            no_cache=False,
+        )
+        options = {"-o": "output", "--output": "output", "-i": "iterations", "--iterations": "iterations"}
+        flags = {"-v": "verbose", "--verbose": "verbose", "--no-cache": "no_cache"}
+    else:
+        return None
+
+    i = 0
+    while i < len(rest):
+        token = rest[i]
+        if token in flags:
+            setattr(args, flags[token], True)
+        elif token in options:
+            if i + 1 >= len(rest):
+                return None
+            value = rest[i + 1]
+            if value.startswith("-"):
+                return None  # argparse reads this as an option, not a value
+            if options[token] in ("port", "iterations"):
+                if not value.isdecimal():
+                    return None
+                value = int(value)
+            setattr(args, options[token], value)
+            i += 1
+        elif token.startswith("-"):
+            return None
+        elif command == "convert" and args.file is None:
+            args.file = token
+        else:
+            return None
+        i += 1
+
+    if command == "convert" and args.file is None:
+        return None
+    return args
+
+
+def main(argv: Optional[list[str]] = None):
+    """Main entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    args = _fast_parse(argv)
+    parser = None
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args(argv)
 
     if args.command == "serve":
         run_api(host=args.host, port=args.port)
     elif args.command == "convert":
-        asyncio.run(convert_file(
+        _run(convert_file(
             args.file,
             args.output,
             verbose=args.verbose,
             max_iterations=args.iterations,
+            use_cache=not args.no_cache,
         ))
     else:
-        parser.print_help()
+        (parser or _build_parser()).print_help()
+
+
+def convert_entry(argv: Optional[list[str]] = None):
+    """Console-script entry point for ``excel-convert`` (same options as ``main.py convert``)."""
+    main(["convert", *(sys.argv[1:] if argv is None else argv)])
+
+
+def serve_entry(argv: Optional[list[str]] = None):
+    """Console-script entry point for ``excel-serve`` (same options as ``main.py serve``)."""
+    main(["serve", *(sys.argv[1:] if argv is None else argv)])
 
 
 if __name__ == "__main__":
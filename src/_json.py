@@ -0,0 +1,34 @@
+"""JSON encode/decode shared by the CLI and the agent tools.
+
+orjson (the `speed` extra) is used when installed; otherwise the stdlib json
+module produces the same text. Both emit UTF-8 without ASCII escaping, and
+decode errors from either backend subclass json.JSONDecodeError.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated encoder/decoder
+    orjson = None
+
+# Compact separators, matching orjson's default output
+_COMPACT = (",", ":")
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Parse JSON text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to non-ASCII-escaped JSON (2-space indent or compact)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT)
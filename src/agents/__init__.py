@@ -11,32 +11,53 @@ Legacy flow (deprecated):
 1. Analyzer → 2. Planner → 3. Generator → 4. Tester
 """
 
-from .analyzer_agent import (
-    create_analyzer_agent,
-    create_analyze_prompt,
-    analyze_layout_structure,
-    analyze_io_mapping,
-    build_formula_dependency_graph,
-    analyze_vba_cell_mapping,
-)
-from .planner_agent import create_planner_agent, create_plan_prompt
-from .spec_agent import create_spec_agent, create_spec_prompt
-from .generator_agent import (
-    create_generator_agent,
-    create_generation_prompt,
-    generate_html_template,
-)
-from .tester_agent import (
-    create_tester_agent,
-    create_test_prompt,
-    TestEvaluation,
-)
-from .test_generator_agent import (
-    create_test_generator_agent,
-    create_test_generation_prompt,
-    GeneratedTestSuite,
-    convert_to_static_test_suite,
-)
+import importlib
+
+# Public name -> submodule. Submodules (and the SDK/openai stack they pull in)
+# are imported on first attribute access (PEP 562), not at package import.
+_LAZY = {
+    # Analyzer
+    "create_analyzer_agent": "analyzer_agent",
+    "create_analyze_prompt": "analyzer_agent",
+    "analyze_layout_structure": "analyzer_agent",
+    "analyze_io_mapping": "analyzer_agent",
+    "build_formula_dependency_graph": "analyzer_agent",
+    "analyze_all_phases": "analyzer_agent",
+    "analyze_vba_cell_mapping": "analyzer_agent",
+    # Planner (legacy)
+    "create_planner_agent": "planner_agent",
+    "create_plan_prompt": "planner_agent",
+    # Spec Agent (TDD)
+    "create_spec_agent": "spec_agent",
+    "create_spec_prompt": "spec_agent",
+    # Generator
+    "create_generator_agent": "generator_agent",
+    "create_generation_prompt": "generator_agent",
+    "generate_html_template": "generator_agent",
+    # Tester (LLM-as-a-Judge)
+    "create_tester_agent": "tester_agent",
+    "create_test_prompt": "tester_agent",
+    "TestEvaluation": "tester_agent",
+    # Test Generator
+    "create_test_generator_agent": "test_generator_agent",
+    "create_test_generation_prompt": "test_generator_agent",
+    "GeneratedTestSuite": "test_generator_agent",
+    "convert_to_static_test_suite": "test_generator_agent",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted((*globals(), *_LAZY))
+
 
 __all__ = [
     # Analyzer
@@ -45,6 +66,7 @@ __all__ = [
     "analyze_layout_structure",
     "analyze_io_mapping",
     "build_formula_dependency_graph",
+    "analyze_all_phases",
     "analyze_vba_cell_mapping",
     # Planner (legacy)
     "create_planner_agent",
@@ -0,0 +1,198 @@
+"""Deterministic LLM response cache for agent runs.
+
+Model responses are keyed on everything the model sees (model name, system
+instructions, input items, settings, tool/output schemas), so a replayed
+request returns the stored ``ModelResponse`` instead of calling the API.
+Tool calls still execute locally; only the LLM round trips are skipped.
+
+Entries are stored as JSON (never pickle), since the cache directory lives
+under the user's home and may be shared; model responses are converted to
+and from their JSON form with a pydantic TypeAdapter.
+
+Enable by passing ``RunConfig(model_provider=CachingModelProvider(LLMCache()))``
+to ``Runner.run`` (the orchestrator does this when given an ``llm_cache``).
+The orchestrator additionally stores final Planner/Spec outputs under
+``output_cache_key`` so a repeated analysis skips those agent runs entirely.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from agents import Model, ModelProvider
+from agents.items import ModelResponse
+from agents.models.multi_provider import MultiProvider
+from pydantic import TypeAdapter, ValidationError
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "excel2web" / "llm"
+
+# ModelResponse <-> JSON-compatible dict for cache entries
+_RESPONSE_ADAPTER = TypeAdapter(ModelResponse)
+
+
+def _jsonable(obj: Any) -> Any:
+    """Stable JSON form of SDK objects for cache keys (no memory addresses)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "params_json_schema"):  # FunctionTool and friends
+        return {"tool": obj.name, "params": obj.params_json_schema}
+    if callable(getattr(obj, "json_schema", None)):  # AgentOutputSchema
+        return {"output_schema": obj.json_schema()}
+    if isinstance(obj, Enum):
+        # Tracing mode does not change the response
+        return None if type(obj).__name__ == "ModelTracing" else obj.value
+    if dataclasses.is_dataclass(obj):
+        return {
+            f.name: getattr(obj, f.name)
+            for f in dataclasses.fields(obj)
+            if not callable(getattr(obj, f.name))
+        }
+    return {"type": type(obj).__name__, "name": getattr(obj, "name", None)}
+
+
+@lru_cache(maxsize=64)
+def _instructions_digest(instructions: str) -> str:
+    """Digest of a (static, multi-KB) instructions string, encoded once per process."""
+    return hashlib.sha256(instructions.encode("utf-8")).hexdigest()
+
+
+def cache_key(model_name: Optional[str], *args: Any, **kwargs: Any) -> str:
+    """SHA-256 over the canonical JSON of a model request."""
+    instructions = kwargs.get("system_instructions")
+    if isinstance(instructions, str):
+        # Agent instructions are module constants; key on their memoized digest
+        # instead of re-escaping and re-encoding the full text per request.
+        kwargs["system_instructions"] = _instructions_digest(instructions)
+    payload = json.dumps(
+        [model_name, args, kwargs], default=_jsonable, sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def output_cache_key(namespace: str, instructions: str, payload: Any) -> str:
+    """Key for a whole agent result: namespace + instructions text + input data.
+
+    Hashing the instructions themselves means any prompt edit invalidates
+    stale entries without a manual version bump. ``payload`` may be
+    pre-serialized JSON (e.g. pydantic's ``model_dump_json()``), which is
+    hashed as is instead of going through ``json.dumps``.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    elif not isinstance(payload, bytes):
+        payload = json.dumps(
+            payload, default=str, sort_keys=True, ensure_ascii=False
+        ).encode("utf-8")
+    h = hashlib.blake2b(digest_size=32)
+    h.update(namespace.encode("utf-8"))
+    h.update(b"\0")
+    h.update(instructions.encode("utf-8"))
+    h.update(b"\0")
+    h.update(payload)
+    return f"{namespace}-{h.hexdigest()}"
+
+
+class LLMCache:
+    """In-memory + on-disk store of JSON-compatible values with optional TTL."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, ttl: Optional[float] = None):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory: dict[str, tuple[float, Any]] = {}
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters for this process."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _fresh(self, stored_at: float) -> bool:
+        return self.ttl is None or time.time() - stored_at < self.ttl
+
+    def _read(self, key: str) -> Optional[tuple[float, Any]]:
+        try:
+            with open(self.cache_dir / f"{key}.json", "rb") as f:
+                entry = json.load(f)
+            return float(entry["stored_at"]), entry["value"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def _write(self, key: str, entry: tuple[float, Any]) -> None:
+        stored_at, value = entry
+        try:
+            data = json.dumps({"stored_at": stored_at, "value": value}, ensure_ascii=False)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+            tmp.write_text(data, encoding="utf-8")
+            tmp.replace(self.cache_dir / f"{key}.json")
+        except (OSError, TypeError, ValueError):
+            pass  # best effort: a non-JSON value is simply not persisted
+
+    async def get(self, key: str) -> Any:
+        """Return the cached value for key, or None."""
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._read, key)
+            if entry is not None:
+                self._memory[key] = entry
+        if entry is not None and self._fresh(entry[0]):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-compatible value under key (memory now, disk off the event loop)."""
+        entry = (time.time(), value)
+        self._memory[key] = entry
+        await asyncio.to_thread(self._write, key, entry)
+
+
+class CachingModel(Model):
+    """Model wrapper that serves repeated requests from an LLMCache."""
+
+    def __init__(self, inner: Model, model_name: Optional[str], cache: LLMCache):
+        self._inner = inner
+        self._model_name = model_name
+        self._cache = cache
+
+    async def get_response(self, *args, **kwargs):
+        key = cache_key(self._model_name, *args, **kwargs)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            try:
+                return _RESPONSE_ADAPTER.validate_python(cached)
+            except ValidationError:
+                pass  # written by an incompatible SDK version; refetch
+        response = await self._inner.get_response(*args, **kwargs)
+        await self._cache.set(key, _RESPONSE_ADAPTER.dump_python(response, mode="json"))
+        return response
+
+    def stream_response(self, *args, **kwargs):
+        # Streams are passed through uncached
+        return self._inner.stream_response(*args, **kwargs)
+
+
+class CachingModelProvider(ModelProvider):
+    """ModelProvider that wraps every resolved model with a CachingModel."""
+
+    def __init__(self, cache: LLMCache, inner: Optional[ModelProvider] = None):
+        self._cache = cache
+        self._inner = inner or MultiProvider()
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return CachingModel(self._inner.get_model(model_name), model_name, self._cache)
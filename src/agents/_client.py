@@ -0,0 +1,26 @@
+"""One AsyncOpenAI client shared by every agent run in a block.
+
+The Agents SDK reads its default client from process-global state. The
+shared client is closed when the block exits, so the previous default is put
+back at that point; later runs in the same process (repeated conversions,
+tests) never pick up a closed client.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from agents import set_default_openai_client
+from agents.models import _openai_shared
+from openai import AsyncOpenAI
+
+
+@asynccontextmanager
+async def shared_openai_client() -> AsyncIterator[AsyncOpenAI]:
+    """Open an AsyncOpenAI client and make it the SDK default until the block exits."""
+    previous = _openai_shared.get_default_openai_client()
+    async with AsyncOpenAI() as client:
+        set_default_openai_client(client)
+        try:
+            yield client
+        finally:
+            _openai_shared.set_default_openai_client(previous)
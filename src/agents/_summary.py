@@ -0,0 +1,26 @@
+"""Shared rendering of ExcelAnalysis fragments for agent prompts.
+
+The Planner and Spec prompts describe each sheet with the same header block;
+it lives here so both agents format (and truncate) it identically.
+"""
+
+from itertools import islice
+
+
+def _cell_preview(cells: list[str], limit: int = 10) -> str:
+    """First `limit` cell addresses, comma-separated, with '...' if truncated."""
+    preview = ", ".join(islice(cells, limit))
+    return preview + "..." if len(cells) > limit else preview
+
+
+def render_sheet_header(sheet: dict) -> str:
+    """Name, dimensions, used range and input/output cell previews of a sheet."""
+    inputs = sheet["input_cells"]
+    outputs = sheet["output_cells"]
+    return f"""
+### Sheet: {sheet['name']}
+- Dimensions: {sheet['row_count']} rows × {sheet['col_count']} cols
+- Used range: {sheet['used_range']}
+- Input cells ({len(inputs)}): {_cell_preview(inputs)}
+- Output cells ({len(outputs)}): {_cell_preview(outputs)}
+"""
@@ -7,16 +7,92 @@ Implements 4-phase analysis flow:
 4. VBA Relationship Extraction - Macro-to-cell mappings
 """
 
+import heapq
+import os
 import re
-from collections import defaultdict
-from typing import Any
+import statistics
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from sys import intern
 
 from agents import Agent, function_tool
+from openpyxl.utils import get_column_letter
 
+from src._json import json_dumps as _dumps, json_loads as _loads
 from src.models import ExcelAnalysis
 from src.tools.excel_analyzer import analyze_excel_file, get_cell_data, get_vba_module_code
 
 
+_ROW_RE = re.compile(r"\d+")
+
+# VBA cell-reference patterns merged into one alternation so the module code is
+# scanned once; the matched group name identifies the reference type
+_CELL_REF_RE = re.compile(
+    r'Range\("(?P<Range>[A-Z]+\d+(?::[A-Z]+\d+)?)"\)'
+    r'|Cells\((?P<row>\d+),\s*(?P<col>\d+)\)'
+    r'|\[(?P<Bracket>[A-Z]+\d+)\]'
+    r'|(?P<ValueAssignment>\.Value\s*=)'
+)
+_CELL_REF_TYPES = {"Range": "Range", "col": "Cells", "Bracket": "Bracket", "ValueAssignment": "ValueAssignment"}
+# Literal anchors; a module containing none of them cannot match _CELL_REF_RE
+_CELL_REF_SENTINELS = ('Range("', "Cells(", "[", ".Value")
+_PROC_RE = re.compile(r'(?:Public |Private )?(Sub|Function)\s+(\w+)')
+_EVENT_RE = re.compile(r'^(Worksheet_|Workbook_|btn|cmd)')
+# Event prefix -> handler "type" (None for workbook/worksheet events)
+_EVENT_TYPES = {
+    "Worksheet_": None,
+    "Workbook_": None,
+    "btn": "button_click",
+    "cmd": "button_click",
+}
+_CALC_KW_RE = re.compile(r'calc|compute|update|total|sum|get', re.IGNORECASE)
+
+# Top-K cells reported in dependency-graph summaries (keeps LLM payloads bounded)
+_TOP_K = 20
+
+def _row_of(addr: str) -> int | None:
+    """Row number of a cell address like "B12" (single regex match)."""
+    match = _ROW_RE.search(addr)
+    return int(match.group()) if match else None
+
+
+def _mean_row(cells: list[dict]) -> float | None:
+    """Mean row number of {"cell": addr} entries, or None if none parse."""
+    rows = [r for r in map(_row_of, (c["cell"] for c in cells)) if r is not None]
+    return statistics.fmean(rows) if rows else None
+
+
+# =============================================================================
+# Parse Cache
+# =============================================================================
+
+def _file_key(file_path: str) -> tuple[str, int, int]:
+    """Cache key for a workbook: resolved path plus mtime/size (auto-invalidates on edit)."""
+    stat = os.stat(file_path)
+    return str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=32)
+def _cached_analysis(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a workbook once per (path, mtime, size)."""
+    return analyze_excel_file(path).model_dump()
+
+
+@lru_cache(maxsize=32)
+def _cached_sheet_cells(path: str, mtime_ns: int, size: int, sheet_name: str | None) -> dict:
+    """Read a worksheet's cells once per (path, mtime, size, sheet)."""
+    cells = get_cell_data(path, sheet_name)
+    return {addr: cell.model_dump() for addr, cell in cells.items()}
+
+
+@lru_cache(maxsize=128)
+def _cached_vba_code(path: str, mtime_ns: int, size: int, module_name: str) -> dict:
+    """Extract one VBA module once per (path, mtime, size, module)."""
+    return get_vba_module_code(path, module_name)
+
+
 # =============================================================================
 # Phase 1: Cell Layout & Structure Tools
 # =============================================================================
@@ -40,8 +116,7 @@ def analyze_excel(file_path: str) -> dict:
     Returns:
         Complete analysis as a dictionary
     """
-    analysis = analyze_excel_file(file_path)
-    return analysis.model_dump()
+    return dict(_cached_analysis(*_file_key(file_path)))
 
 
 @function_tool
@@ -63,8 +138,7 @@ def get_sheet_cells(file_path: str, sheet_name: str = None) -> dict:
     Returns:
         Dictionary mapping cell addresses to cell information
     """
-    cells = get_cell_data(file_path, sheet_name)
-    return {addr: cell.model_dump() for addr, cell in cells.items()}
+    return dict(_cached_sheet_cells(*_file_key(file_path), sheet_name))
 
 
 @function_tool
@@ -88,10 +162,15 @@ def analyze_layout_structure(analysis_dict: str) -> str:
     import json
 
     try:
-        analysis = json.loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
+        analysis = _loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
     except json.JSONDecodeError:
         return json.dumps({"error": "Invalid analysis data"})
 
+    return _dumps(_layout_structure(analysis))
+
+
+def _layout_structure(analysis: dict) -> dict:
+    """Phase 1: section and merged-region layout of the parsed workbook."""
     layout_info = {
         "sections": [],
         "merged_regions": [],
@@ -122,7 +201,7 @@ def analyze_layout_structure(analysis_dict: str) -> str:
                 "header_rows": f"{min_row}-{min_row + 2}",
                 "body_rows": f"{min_row + 3}-{max_row - 2}",
                 "footer_rows": f"{max_row - 1}-{max_row}",
-                "column_span": f"{chr(64 + min_col)}-{chr(64 + min(max_col, 26))}"
+                "column_span": f"{get_column_letter(min_col)}-{get_column_letter(max_col)}"
             })
 
         # Check for merged cells patterns
@@ -143,7 +222,7 @@ def analyze_layout_structure(analysis_dict: str) -> str:
             f"{len(sheets)} sheets detected - consider tabbed interface or multi-page form"
         )
 
-    return json.dumps(layout_info, ensure_ascii=False, indent=2)
+    return layout_info
 
 
 # =============================================================================
@@ -171,10 +250,15 @@ def analyze_io_mapping(analysis_dict: str) -> str:
     import json
 
     try:
-        analysis = json.loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
+        analysis = _loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
     except json.JSONDecodeError:
         return json.dumps({"error": "Invalid analysis data"})
 
+    return _dumps(_io_mapping(analysis))
+
+
+def _io_mapping(analysis: dict) -> dict:
+    """Phase 2: input/output/intermediate cell mapping and data-flow direction."""
     io_mapping = {
         "input_cells": [],
         "output_cells": [],
@@ -185,30 +269,31 @@ def analyze_io_mapping(analysis_dict: str) -> str:
         "output_groups": []
     }
 
-    # Collect input cells from all sheets
+    # Collect input cells and formula cells in one pass over the sheets
     input_cells = set()
-    for sheet in analysis.get("sheets", []):
-        input_cells.update(sheet.get("input_cells", []))
-
-    # Get all cells with formulas
     formula_cells = set()
     formula_dependencies = {}
 
-    sheets = analysis.get("sheets", [])
-    for sheet in sheets:
+    for sheet in analysis.get("sheets", []):
+        input_cells.update(sheet.get("input_cells", []))
         for formula_info in sheet.get("formulas", []):
-            cell = formula_info.get("cell", "")
+            # Interned addresses share one str object across every graph structure
+            cell = intern(formula_info.get("cell", ""))
             # Support both 'dependencies' and 'references' keys
             refs = formula_info.get("dependencies", formula_info.get("references", []))
+            refs = [intern(ref) for ref in refs]
             formula_cells.add(cell)
             formula_dependencies[cell] = refs
 
+    # Inverted index: cell -> number of formulas that reference it
+    usage = Counter()
+    for deps in formula_dependencies.values():
+        usage.update(set(deps))
+
     # Categorize cells
     for cell in input_cells:
         # Check if this input is used by multiple formulas (key input)
-        usage_count = sum(
-            1 for deps in formula_dependencies.values() if cell in deps
-        )
+        usage_count = usage.get(cell, 0)
         io_mapping["input_cells"].append({
             "cell": cell,
             "usage_count": usage_count,
@@ -216,9 +301,7 @@ def analyze_io_mapping(analysis_dict: str) -> str:
         })
 
     # Identify intermediate vs output cells
-    cells_used_by_formulas = set()
-    for deps in formula_dependencies.values():
-        cells_used_by_formulas.update(deps)
+    cells_used_by_formulas = usage.keys()
 
     for cell, deps in formula_dependencies.items():
         is_intermediate = cell in cells_used_by_formulas
@@ -235,16 +318,10 @@ def analyze_io_mapping(analysis_dict: str) -> str:
 
     # Analyze data flow direction
     if io_mapping["input_cells"] and io_mapping["output_cells"]:
-        # Extract row numbers
-        input_rows = [int(re.search(r'\d+', c["cell"]).group())
-                      for c in io_mapping["input_cells"] if re.search(r'\d+', c["cell"])]
-        output_rows = [int(re.search(r'\d+', c["cell"]).group())
-                       for c in io_mapping["output_cells"] if re.search(r'\d+', c["cell"])]
-
-        if input_rows and output_rows:
-            avg_input_row = sum(input_rows) / len(input_rows)
-            avg_output_row = sum(output_rows) / len(output_rows)
+        avg_input_row = _mean_row(io_mapping["input_cells"])
+        avg_output_row = _mean_row(io_mapping["output_cells"])
 
+        if avg_input_row is not None and avg_output_row is not None:
             if avg_input_row < avg_output_row:
                 io_mapping["data_flow"] = "top-to-bottom"
             elif avg_input_row > avg_output_row:
@@ -266,7 +343,7 @@ def analyze_io_mapping(analysis_dict: str) -> str:
                 })
                 current_group = []
 
-    return json.dumps(io_mapping, ensure_ascii=False, indent=2)
+    return io_mapping
 
 
 # =============================================================================
@@ -279,7 +356,7 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
     Build a complete formula dependency graph.
 
     Phase 3 of sequential analysis - creates:
-    - Directed graph of cell dependencies
+    - Dependency graph summary (counts, top fan-in/fan-out cells, degree histogram)
     - Calculation order (topological sort)
     - Circular reference detection
     - Formula complexity scoring
@@ -294,16 +371,22 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
     import json
 
     try:
-        analysis = json.loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
+        analysis = _loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
     except json.JSONDecodeError:
         return json.dumps({"error": "Invalid analysis data"})
 
+    return _dumps(_dependency_graph(analysis))
+
+
+def _dependency_graph(analysis: dict) -> dict:
+    """Phase 3: dependency graph, calculation order, depths and formula chains."""
     graph = {
-        "nodes": [],
-        "edges": [],
+        "nodes": {},
         "calculation_order": [],
         "circular_references": [],
+        "circular_reference_count": 0,
         "complexity_scores": {},
+        "complexity_score_count": 0,
         "max_depth": 0,
         "formula_chains": []
     }
@@ -313,13 +396,17 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
     reverse_adjacency = defaultdict(list)  # cell -> cells that depend on it
     all_cells = set()
 
+    formula_entries = []  # (cell, formula, refs) in sheet order
+
     sheets = analysis.get("sheets", [])
     for sheet in sheets:
         for formula_info in sheet.get("formulas", []):
-            cell = formula_info.get("cell", "")
+            # Interned addresses share one str object across every graph structure
+            cell = intern(formula_info.get("cell", ""))
             # Support both 'dependencies' and 'references' keys
             refs = formula_info.get("dependencies", formula_info.get("references", []))
-            formula = formula_info.get("formula", "")
+            refs = [intern(ref) for ref in refs]
+            formula_entries.append((cell, formula_info.get("formula", ""), refs))
 
             all_cells.add(cell)
             all_cells.update(refs)
@@ -328,21 +415,28 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
             for ref in refs:
                 reverse_adjacency[ref].append(cell)
 
-            # Add node info
-            graph["nodes"].append({
+    # Summarize the graph instead of returning every node/edge to the LLM
+    fan_in = {cell: len(users) for cell, users in reverse_adjacency.items()}
+    graph["nodes"] = {
+        "count": len(all_cells),
+        "formula_count": len(formula_entries),
+        "edge_count": sum(len(refs) for _, _, refs in formula_entries),
+        "top_by_fanin": [
+            {"cell": cell, "used_by_count": count}
+            for cell, count in heapq.nlargest(_TOP_K, fan_in.items(), key=itemgetter(1))
+        ],
+        "top_by_fanout": [
+            {
                 "cell": cell,
                 "formula": formula[:50] if formula else "",  # Truncate long formulas
                 "depends_on_count": len(refs),
-                "used_by_count": len(reverse_adjacency.get(cell, []))
-            })
-
-            # Add edges
-            for ref in refs:
-                graph["edges"].append({
-                    "from": ref,
-                    "to": cell,
-                    "type": "data_flow"
-                })
+            }
+            for cell, formula, refs in heapq.nlargest(
+                _TOP_K, formula_entries, key=lambda entry: len(entry[2])
+            )
+        ],
+        "degree_histogram": dict(Counter(len(deps) for deps in adjacency.values())),
+    }
 
     # Topological sort for calculation order
     in_degree = defaultdict(int)
@@ -351,12 +445,12 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
             in_degree[cell] += 1
 
     # Find cells with no dependencies (starting points)
-    queue = [cell for cell in all_cells if in_degree[cell] == 0]
+    queue = deque(cell for cell in all_cells if in_degree[cell] == 0)
     calc_order = []
     visited = set()
 
     while queue:
-        cell = queue.pop(0)
+        cell = queue.popleft()
         if cell in visited:
             continue
         visited.add(cell)
@@ -369,33 +463,33 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
 
     graph["calculation_order"] = calc_order[:20]  # Limit for readability
 
-    # Detect circular references
-    for cell in all_cells:
-        if cell not in visited:
-            graph["circular_references"].append(cell)
-
-    # Calculate complexity scores
-    def get_depth(cell: str, memo: dict = None) -> int:
-        if memo is None:
-            memo = {}
-        if cell in memo:
-            return memo[cell]
-        if cell not in adjacency or not adjacency[cell]:
-            memo[cell] = 0
-            return 0
-        depth = 1 + max(get_depth(dep, memo) for dep in adjacency[cell])
-        memo[cell] = depth
-        return depth
-
-    depth_memo = {}
-    for cell in adjacency:
-        depth = get_depth(cell, depth_memo)
-        graph["complexity_scores"][cell] = {
-            "depth": depth,
+    # Detect circular references (top-K listed, like the node summary)
+    circular = sorted(cell for cell in all_cells if cell not in visited)
+    graph["circular_references"] = circular[:_TOP_K]
+    graph["circular_reference_count"] = len(circular)
+
+    # Calculate complexity scores: dependencies precede dependents in calc_order,
+    # so depths fill in one iterative pass (cells on cycles come last)
+    depths = {}
+    for cell in (*calc_order, *(c for c in adjacency if c not in visited)):
+        deps = adjacency.get(cell)
+        depths[cell] = 1 + max(depths.get(dep, 0) for dep in deps) if deps else 0
+
+    graph["max_depth"] = max((depths[cell] for cell in adjacency), default=0)
+    most_complex = heapq.nlargest(
+        _TOP_K,
+        adjacency,
+        key=lambda cell: depths[cell] * 10 + len(adjacency[cell]),
+    )
+    graph["complexity_scores"] = {
+        cell: {
+            "depth": depths[cell],
             "direct_deps": len(adjacency[cell]),
-            "score": depth * 10 + len(adjacency[cell])
+            "score": depths[cell] * 10 + len(adjacency[cell]),
         }
-        graph["max_depth"] = max(graph["max_depth"], depth)
+        for cell in most_complex
+    }
+    graph["complexity_score_count"] = len(adjacency)
 
     # Identify key formula chains
     output_cells = [cell for cell in adjacency if not reverse_adjacency.get(cell)]
@@ -415,7 +509,40 @@ def build_formula_dependency_graph(analysis_dict: str) -> str:
                 "length": len(chain)
             })
 
-    return json.dumps(graph, ensure_ascii=False, indent=2)
+    return graph
+
+
+# =============================================================================
+# Fused Phase 1-3 Tool
+# =============================================================================
+
+@function_tool
+def analyze_all_phases(analysis_dict: str) -> str:
+    """
+    Run Phase 1-3 analysis (layout, I/O mapping, dependency graph) in one call.
+
+    Equivalent to calling analyze_layout_structure, analyze_io_mapping and
+    build_formula_dependency_graph on the same data, but parses the
+    analysis once and needs a single tool round trip.
+
+    Args:
+        analysis_dict: JSON string of ExcelAnalysis data
+
+    Returns:
+        JSON string with "layout", "io" and "graph" sections
+    """
+    import json
+
+    try:
+        analysis = _loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
+    except json.JSONDecodeError:
+        return json.dumps({"error": "Invalid analysis data"})
+
+    return _dumps({
+        "layout": _layout_structure(analysis),
+        "io": _io_mapping(analysis),
+        "graph": _dependency_graph(analysis),
+    })
 
 
 # =============================================================================
@@ -435,7 +562,8 @@ def analyze_vba_cell_mapping(analysis_dict: str) -> str:
     - VBA-to-JavaScript porting recommendations
 
     Args:
-        analysis_dict: JSON string of ExcelAnalysis data
+        analysis_dict: JSON string of ExcelAnalysis data (in-process callers
+            may pass the already-decoded dict; see _vba_cell_mapping)
 
     Returns:
         VBA-cell mapping analysis as JSON string
@@ -443,10 +571,15 @@ def analyze_vba_cell_mapping(analysis_dict: str) -> str:
     import json
 
     try:
-        analysis = json.loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
+        analysis = _loads(analysis_dict) if isinstance(analysis_dict, str) else analysis_dict
     except json.JSONDecodeError:
         return json.dumps({"error": "Invalid analysis data"})
 
+    return _dumps(_vba_cell_mapping(analysis))
+
+
+def _vba_cell_mapping(analysis: dict) -> dict:
+    """VBA-cell mapping for an already-decoded ExcelAnalysis dict."""
     vba_mapping = {
         "has_vba": False,
         "modules": [],
@@ -467,16 +600,25 @@ def analyze_vba_cell_mapping(analysis_dict: str) -> str:
         vba_mapping["porting_recommendations"].append(
             "No VBA detected - pure formula conversion"
         )
-        return json.dumps(vba_mapping, ensure_ascii=False, indent=2)
+        return vba_mapping
 
     vba_mapping["has_vba"] = True
+    unique_refs: set[str] = set()
+
+    # Bound methods hoisted out of the module loop
+    modules_append = vba_mapping["modules"].append
+    global_refs_extend = vba_mapping["cell_references"].extend
+    event_append = vba_mapping["event_handlers"].append
+    calc_append = vba_mapping["calculation_procedures"].append
+    validation_append = vba_mapping["validation_logic"].append
+    unique_refs_update = unique_refs.update
 
     # Analyze each module
     for module in vba_modules:
         module_name = module.get("name", "Unknown")
         module_type = module.get("module_type", "Module")
-        code = module.get("code", "")
-        procedures = module.get("procedures", [])
+        code = module.get("code") or ""
+        procedures = module.get("procedures") or ()
 
         module_info = {
             "name": module_name,
@@ -485,71 +627,73 @@ def analyze_vba_cell_mapping(analysis_dict: str) -> str:
             "cell_refs": []
         }
 
-        # Extract cell references
-        cell_patterns = [
-            (r'Range\("([A-Z]+\d+(?::[A-Z]+\d+)?)"\)', "Range"),
-            (r'Cells\((\d+),\s*(\d+)\)', "Cells"),
-            (r'\[([A-Z]+\d+)\]', "Bracket"),
-            (r'\.Value\s*=', "ValueAssignment"),
-        ]
-
-        for pattern, ref_type in cell_patterns:
-            matches = re.findall(pattern, code)
-            for match in matches:
-                if isinstance(match, tuple):
-                    ref = f"R{match[0]}C{match[1]}"
+        # Nothing to scan or classify
+        if not code and not procedures:
+            modules_append(module_info)
+            continue
+
+        # Extract cell references (single pass; grouped by type in pattern order).
+        # Placeholder modules (empty class modules etc.) skip the scan entirely.
+        if code and any(sentinel in code for sentinel in _CELL_REF_SENTINELS):
+            refs_by_type = {ref_type: [] for ref_type in _CELL_REF_TYPES.values()}
+            for match in _CELL_REF_RE.finditer(code):
+                group = match.lastgroup
+                if group == "col":
+                    ref = f"R{match['row']}C{match['col']}"
                 else:
-                    ref = match
-                module_info["cell_refs"].append({
-                    "reference": ref,
-                    "type": ref_type
-                })
-                vba_mapping["cell_references"].append({
-                    "module": module_name,
-                    "reference": ref,
-                    "type": ref_type
-                })
+                    ref = match[group]
+                refs_by_type[_CELL_REF_TYPES[group]].append(ref)
+
+            # Each (reference, type) pair is recorded once per module; repeated
+            # uses of the same cell collapse to a single entry.
+            local_refs = [
+                {"reference": ref, "type": ref_type}
+                for ref_type, refs in refs_by_type.items()
+                for ref in dict.fromkeys(refs)
+            ]
+            module_info["cell_refs"] = local_refs
+            global_refs_extend({"module": module_name, **r} for r in local_refs)
+            for refs in refs_by_type.values():
+                unique_refs_update(refs)
 
         # Analyze procedures from module data or extract from code
-        proc_list = procedures if procedures else []
+        proc_list = procedures
         if not proc_list and code:
             # Extract from code if not provided
-            proc_matches = re.findall(
-                r'(?:Public |Private )?(Sub|Function)\s+(\w+)',
-                code
-            )
-            proc_list = [name for _, name in proc_matches]
+            proc_list = [name for _, name in _PROC_RE.findall(code)]
 
         for proc_name in proc_list:
-            # Identify event handlers
-            if proc_name.startswith("Worksheet_") or proc_name.startswith("Workbook_"):
-                vba_mapping["event_handlers"].append({
-                    "event": proc_name,
-                    "module": module_name
-                })
-            # Identify button/control handlers
-            elif proc_name.startswith("btn") or proc_name.startswith("cmd"):
-                vba_mapping["event_handlers"].append({
-                    "event": proc_name,
-                    "module": module_name,
-                    "type": "button_click"
-                })
+            # Identify event handlers and button/control handlers
+            event = _EVENT_RE.match(proc_name)
+            if event:
+                handler_type = _EVENT_TYPES[event.group(1)]
+                if handler_type is None:
+                    event_append({
+                        "event": proc_name,
+                        "module": module_name
+                    })
+                else:
+                    event_append({
+                        "event": proc_name,
+                        "module": module_name,
+                        "type": handler_type
+                    })
 
             # Identify calculation procedures
-            if any(kw in proc_name.lower() for kw in ["calc", "compute", "update", "total", "sum", "get"]):
-                vba_mapping["calculation_procedures"].append({
+            if _CALC_KW_RE.search(proc_name):
+                calc_append({
                     "procedure": proc_name,
                     "module": module_name
                 })
 
         # Extract validation logic
         if "If" in code and ("MsgBox" in code or "Exit" in code):
-            vba_mapping["validation_logic"].append({
+            validation_append({
                 "module": module_name,
                 "type": "conditional_validation"
             })
 
-        vba_mapping["modules"].append(module_info)
+        modules_append(module_info)
 
     # Generate porting recommendations
     if vba_mapping["event_handlers"]:
@@ -567,13 +711,13 @@ def analyze_vba_cell_mapping(analysis_dict: str) -> str:
             f"{len(vba_mapping['validation_logic'])} validation blocks → Convert to form validation"
         )
 
-    unique_cells = len(set(r["reference"] for r in vba_mapping["cell_references"]))
+    unique_cells = len(unique_refs)
     if unique_cells > 0:
         vba_mapping["porting_recommendations"].append(
             f"{unique_cells} unique cell references → Map to HTML input/output elements"
         )
 
-    return json.dumps(vba_mapping, ensure_ascii=False, indent=2)
+    return vba_mapping
 
 
 # =============================================================================
@@ -595,9 +739,11 @@ def get_vba_code(file_path: str, module_name: str) -> str:
     Returns:
         JSON with full module code and procedure list
     """
-    import json
-    result = get_vba_module_code(file_path, module_name)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    try:
+        key = _file_key(file_path)
+    except OSError as e:
+        return _dumps({"error": str(e)})
+    return _dumps(_cached_vba_code(*key, module_name))
 
 
 # =============================================================================
@@ -608,6 +754,10 @@ ANALYZER_INSTRUCTIONS = """You are an Excel file analyzer expert that performs *
 
 ## Analysis Flow (MUST FOLLOW IN ORDER)
 
+**Fast path:** after `analyze_excel`, call `analyze_all_phases` once to get the
+Phase 1-3 results (layout, I/O mapping, dependency graph) together. Use the
+individual phase tools below only if you need to re-run a single phase.
+
 ### Phase 1: 셀의 위치와 구조 (Cell Layout & Structure)
 Analyze the physical layout first:
 - Use `analyze_excel` to get raw data
@@ -691,6 +841,8 @@ def create_analyzer_agent() -> Agent:
             analyze_io_mapping,
             # Phase 3: Dependencies
             build_formula_dependency_graph,
+            # Phase 1-3 in one call
+            analyze_all_phases,
             # Phase 4: VBA
             analyze_vba_cell_mapping,
             get_vba_code,  # For detailed VBA module analysis
@@ -715,6 +867,8 @@ File: {file_path}
 
 ## Required Analysis Flow
 
+Tip: analyze_excel → analyze_all_phases covers Phases 1-3 in a single tool call.
+
 1. **Phase 1 - 셀의 위치와 구조 (Layout)**
    - analyze_excel → analyze_layout_structure
    - Identify sections, merged cells, visual structure
@@ -1,5 +1,7 @@
 """Generator Agent - Produces HTML/CSS/JS from WebAppPlan."""
 
+from functools import lru_cache
+
 from pydantic import BaseModel
 
 from agents import Agent, AgentOutputSchema, function_tool
@@ -12,6 +14,21 @@ from src.tools import (
 )
 
 
+_NL = "\n"
+
+
+# The same formula is often copied down a column; memoize on its text.
+@lru_cache(maxsize=4096)
+def _cached_is_simple(formula: str) -> bool:
+    return is_simple_formula(formula)
+
+
+@lru_cache(maxsize=2048)
+def _cached_convert(formula: str):
+    # No cell map from the tool, so the result depends on the text alone
+    return convert_simple_formula(formula, None)
+
+
 class FormulaConversionResult(BaseModel):
     """Result of formula conversion."""
     success: bool
@@ -38,7 +55,7 @@ def convert_formula(formula: str) -> FormulaConversionResult:
     Returns:
         FormulaConversionResult with conversion result
     """
-    result = convert_simple_formula(formula, {})
+    result = _cached_convert(formula)
     return FormulaConversionResult(
         success=result.success,
         js_code=result.js_code,
@@ -58,7 +75,7 @@ def check_formula_complexity(formula: str) -> FormulaComplexityResult:
     Returns:
         FormulaComplexityResult with complexity assessment
     """
-    is_simple = is_simple_formula(formula)
+    is_simple = _cached_is_simple(formula)
     return FormulaComplexityResult(
         formula=formula,
         is_simple=is_simple,
@@ -203,6 +220,9 @@ Be meticulous - the generated code must work perfectly on first load.
 """
 
 
+_WEBAPP_SCHEMA = AgentOutputSchema(GeneratedWebApp, strict_json_schema=False)
+
+
 def create_generator_agent() -> Agent:
     """Create the Generator Agent instance."""
     return Agent(
@@ -210,7 +230,7 @@ def create_generator_agent() -> Agent:
         instructions=GENERATOR_INSTRUCTIONS,
         tools=[convert_formula, check_formula_complexity, get_js_helpers],
         model="gpt-5.1-codex",  # Codex model - optimized for code generation
-        output_type=AgentOutputSchema(GeneratedWebApp, strict_json_schema=False),  # Structured output
+        output_type=_WEBAPP_SCHEMA,  # Structured output
     )
 
 
@@ -242,26 +262,23 @@ def create_generation_prompt(plan_dict: dict, analysis_dict: dict = None) -> str
         form_fields = comp.get("form_fields", [])
         output_fields = comp.get("output_fields", [])
 
-        field_lines = []
-        for f in form_fields:
-            field_lines.append(
-                f"  - {f['label']} ({f['name']}): {f['field_type']}, "
-                f"cell={f['source_cell']}, default={f.get('default_value')}"
-            )
-
-        output_lines = []
-        for o in output_fields:
-            output_lines.append(
-                f"  - {o['label']} ({o['name']}): {o['format']}, cell={o['source_cell']}"
-            )
+        field_lines = [
+            f"  - {f['label']} ({f['name']}): {f['field_type']}, "
+            f"cell={f['source_cell']}, default={f.get('default_value')}"
+            for f in form_fields
+        ]
+        output_lines = [
+            f"  - {o['label']} ({o['name']}): {o['format']}, cell={o['source_cell']}"
+            for o in output_fields
+        ]
 
         component_desc.append(f"""
 ### {title} ({comp_type})
 Input Fields:
-{chr(10).join(field_lines) if field_lines else '  (none)'}
+{_NL.join(field_lines) if field_lines else '  (none)'}
 
 Output Fields:
-{chr(10).join(output_lines) if output_lines else '  (none)'}
+{_NL.join(output_lines) if output_lines else '  (none)'}
 """)
 
     # Build function descriptions
@@ -274,12 +291,11 @@ Output Fields:
             func_desc.append(f"  Excel: {fn['source_formula']}")
 
     # Build cell mapping
-    cell_mapping = "Input Cell Map:\n"
-    for name, cell in input_map.items():
-        cell_mapping += f"  {name} → {cell}\n"
-    cell_mapping += "\nOutput Cell Map:\n"
-    for name, cell in output_map.items():
-        cell_mapping += f"  {name} → {cell}\n"
+    mapping_parts = ["Input Cell Map:\n"]
+    mapping_parts.extend(f"  {name} → {cell}\n" for name, cell in input_map.items())
+    mapping_parts.append("\nOutput Cell Map:\n")
+    mapping_parts.extend(f"  {name} → {cell}\n" for name, cell in output_map.items())
+    cell_mapping = "".join(mapping_parts)
 
     # Print layout
     print_info = f"""
@@ -292,15 +308,17 @@ Margins: {print_layout.get('margins', {})}
     formulas_section = ""
     if analysis_dict:
         sheets = analysis_dict.get("sheets", [])
-        formulas_section = "\n## Original Excel Formulas\n"
+        formula_parts = ["\n## Original Excel Formulas\n"]
         for sheet in sheets:
             formulas = sheet.get("formulas", [])
             if formulas:
-                formulas_section += f"\n### {sheet['name']}\n"
-                for f in formulas[:20]:  # Limit to first 20
-                    formulas_section += f"- {f['cell']}: {f['formula']}\n"
+                formula_parts.append(f"\n### {sheet['name']}\n")
+                formula_parts.extend(
+                    f"- {f['cell']}: {f['formula']}\n" for f in formulas[:20]  # Limit to first 20
+                )
                 if len(formulas) > 20:
-                    formulas_section += f"  ... and {len(formulas) - 20} more\n"
+                    formula_parts.append(f"  ... and {len(formulas) - 20} more\n")
+        formulas_section = "".join(formula_parts)
 
     return f"""# Web App Generation Request
 
@@ -312,7 +330,7 @@ Margins: {print_layout.get('margins', {})}
 {''.join(component_desc)}
 
 ## JavaScript Functions to Implement
-{chr(10).join(func_desc) if func_desc else '(none specified)'}
+{_NL.join(func_desc) if func_desc else '(none specified)'}
 
 ## Cell Mappings
 {cell_mapping}
@@ -332,59 +350,14 @@ Include the helper functions from get_js_helpers in your output.
 """
 
 
-def generate_html_template(plan: WebAppPlan) -> str:
-    """
-    Generate a basic HTML template from a WebAppPlan.
-    This is a fallback/utility function for simple cases.
-
-    Args:
-        plan: WebAppPlan object
-
-    Returns:
-        HTML string
-    """
-    # Build form fields HTML
-    form_fields_html = []
-    for comp in plan.components:
-        for field in comp.form_fields:
-            field_id = field.name.replace(" ", "_").lower()
-            input_type = _get_html_input_type(field.field_type)
-            default = field.default_value if field.default_value else ""
-
-            form_fields_html.append(f"""
-            <div class="mb-3">
-                <label for="{field_id}" class="form-label">{field.label}</label>
-                <input type="{input_type}" class="form-control" id="{field_id}"
-                       x-model="{field.name}" value="{default}"
-                       {'required' if field.required else ''}>
-            </div>
-            """)
-
-    # Build output fields HTML
-    output_fields_html = []
-    for comp in plan.components:
-        for output in comp.output_fields:
-            output_id = output.name.replace(" ", "_").lower()
-            format_filter = _get_format_filter(output.format)
-
-            output_fields_html.append(f"""
-            <div class="mb-3">
-                <label class="form-label">{output.label}</label>
-                <div class="form-control-plaintext border rounded p-2"
-                     x-text="{format_filter}({output.name})">
-                </div>
-            </div>
-            """)
-
-    # Build print CSS
-    print_css = _generate_print_css(plan.print_layout)
-
-    return f"""<!DOCTYPE html>
+# Static page skeleton for generate_html_template; form and output fields go
+# between HEAD/MID and MID/TAIL respectively.
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{plan.app_name}</title>
+    <title>{app_name}</title>
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
     <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet">
     <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js"></script>
@@ -401,8 +374,8 @@ def generate_html_template(plan: WebAppPlan) -> str:
 </head>
 <body>
     <div class="container py-4" x-data="appData()">
-        <h1 class="mb-4">{plan.app_name}</h1>
-        <p class="text-muted mb-4">{plan.app_description}</p>
+        <h1 class="mb-4">{app_name}</h1>
+        <p class="text-muted mb-4">{app_description}</p>
 
         <div class="row">
             <div class="col-md-6">
@@ -411,7 +384,9 @@ def generate_html_template(plan: WebAppPlan) -> str:
                         <h5 class="mb-0">입력</h5>
                     </div>
                     <div class="card-body">
-                        {''.join(form_fields_html)}
+                        """
+
+_HTML_MID = """
                         <button class="btn btn-primary" @click="calculate()">계산</button>
                     </div>
                 </div>
@@ -423,7 +398,9 @@ def generate_html_template(plan: WebAppPlan) -> str:
                         <h5 class="mb-0">결과</h5>
                     </div>
                     <div class="card-body">
-                        {''.join(output_fields_html)}
+                        """
+
+_HTML_TAIL = """
                         <button class="btn btn-outline-secondary mt-3 no-print" @click="print()">
                             인쇄
                         </button>
@@ -434,7 +411,7 @@ def generate_html_template(plan: WebAppPlan) -> str:
     </div>
 
     <script>
-{get_helper_functions_js()}
+{helpers_js}
 
 function appData() {{
     return {{
@@ -457,28 +434,86 @@ function appData() {{
 """
 
 
-def _get_html_input_type(field_type: str) -> str:
-    """Convert field type to HTML input type."""
-    type_map = {
-        "text": "text",
-        "number": "number",
-        "date": "date",
-        "select": "text",  # Will be replaced with select element
-        "checkbox": "checkbox",
-    }
-    return type_map.get(field_type, "text")
-
-
-def _get_format_filter(format_type: str) -> str:
-    """Get the JavaScript format function name."""
-    format_map = {
-        "text": "",
-        "number": "formatNumber",
-        "currency": "formatCurrency",
-        "percentage": "formatPercent",
-        "date": "",
-    }
-    return format_map.get(format_type, "")
+def generate_html_template(plan: WebAppPlan) -> str:
+    """
+    Generate a basic HTML template from a WebAppPlan.
+    This is a fallback/utility function for simple cases.
+
+    Args:
+        plan: WebAppPlan object
+
+    Returns:
+        HTML string
+    """
+    # Build form fields HTML
+    type_map = _TYPE_MAP
+    format_map = _FORMAT_MAP
+    form_fields_html = []
+    for comp in plan.components:
+        for field in comp.form_fields:
+            field_id = field.name.replace(" ", "_").lower()
+            input_type = type_map.get(field.field_type, "text")
+            default = field.default_value if field.default_value else ""
+
+            form_fields_html.append(f"""
+            <div class="mb-3">
+                <label for="{field_id}" class="form-label">{field.label}</label>
+                <input type="{input_type}" class="form-control" id="{field_id}"
+                       x-model="{field.name}" value="{default}"
+                       {'required' if field.required else ''}>
+            </div>
+            """)
+
+    # Build output fields HTML
+    output_fields_html = []
+    for comp in plan.components:
+        for output in comp.output_fields:
+            output_id = output.name.replace(" ", "_").lower()
+            format_filter = format_map.get(output.format, "")
+
+            output_fields_html.append(f"""
+            <div class="mb-3">
+                <label class="form-label">{output.label}</label>
+                <div class="form-control-plaintext border rounded p-2"
+                     x-text="{format_filter}({output.name})">
+                </div>
+            </div>
+            """)
+
+    # Build print CSS
+    print_css = _generate_print_css(plan.print_layout)
+
+    parts = [
+        _HTML_HEAD.format(
+            app_name=plan.app_name,
+            app_description=plan.app_description,
+            print_css=print_css,
+        )
+    ]
+    parts.extend(form_fields_html)
+    parts.append(_HTML_MID)
+    parts.extend(output_fields_html)
+    parts.append(_HTML_TAIL.format(helpers_js=get_helper_functions_js()))
+    return "".join(parts)
+
+
+# Field type -> HTML input type
+_TYPE_MAP = {
+    "text": "text",
+    "number": "number",
+    "date": "date",
+    "select": "text",  # Will be replaced with select element
+    "checkbox": "checkbox",
+}
+
+# Output format -> JavaScript format function name
+_FORMAT_MAP = {
+    "text": "",
+    "number": "formatNumber",
+    "currency": "formatCurrency",
+    "percentage": "formatPercent",
+    "date": "",
+}
 
 
 def _generate_print_css(print_layout) -> str:
@@ -1,7 +1,11 @@
 """Planner Agent - Designs web app structure from Excel analysis."""
 
-from agents import Agent, AgentOutputSchema
+import io
+from functools import lru_cache
 
+from agents import Agent, AgentOutputSchema, ModelSettings
+
+from src.agents._summary import render_sheet_header
 from src.models import WebAppPlan
 
 
@@ -108,14 +112,21 @@ Be thorough and specific - the Generator agent will implement your plan exactly.
 """
 
 
+_PLAN_SCHEMA = AgentOutputSchema(WebAppPlan, strict_json_schema=False)
+
+
+@lru_cache(maxsize=1)
 def create_planner_agent() -> Agent:
-    """Create the Planner Agent instance."""
+    """Create the Planner Agent instance (built once; agents hold no run state)."""
     return Agent(
         name="WebApp Planner",
         instructions=PLANNER_INSTRUCTIONS,
         tools=[],  # No tools - pure LLM reasoning
         model="gpt-5.2",  # SOTA model for complex reasoning & architecture
-        output_type=AgentOutputSchema(WebAppPlan, strict_json_schema=False),  # Structured output
+        # Instructions are static and sent first, so OpenAI prompt caching reuses
+        # them; a fixed cache key keeps these requests on the same cache shard.
+        model_settings=ModelSettings(extra_args={"prompt_cache_key": "excel2web-planner"}),
+        output_type=_PLAN_SCHEMA,  # Structured output
     )
 
 
@@ -138,20 +149,15 @@ def create_plan_prompt(analysis_dict: dict) -> str:
     complexity = analysis_dict.get("complexity_score", "low")
 
     # Build sheet summaries
-    sheet_summaries = []
+    buf = io.StringIO()
+    write = buf.write
     for sheet in sheets:
-        sheet_summaries.append(f"""
-### Sheet: {sheet['name']}
-- Dimensions: {sheet['row_count']} rows × {sheet['col_count']} cols
-- Used range: {sheet['used_range']}
-- Input cells ({len(sheet['input_cells'])}): {', '.join(sheet['input_cells'][:10])}{'...' if len(sheet['input_cells']) > 10 else ''}
-- Output cells ({len(sheet['output_cells'])}): {', '.join(sheet['output_cells'][:10])}{'...' if len(sheet['output_cells']) > 10 else ''}
-- Formulas ({len(sheet['formulas'])}):
-""")
+        write(render_sheet_header(sheet))
+        write(f"- Formulas ({len(sheet['formulas'])}):\n")
         for f in sheet["formulas"][:5]:
-            sheet_summaries.append(f"  - {f['cell']}: {f['formula']}")
+            write(f"  - {f['cell']}: {f['formula']}")
         if len(sheet["formulas"]) > 5:
-            sheet_summaries.append(f"  - ... and {len(sheet['formulas']) - 5} more")
+            write(f"  - ... and {len(sheet['formulas']) - 5} more")
 
     # Build VBA summary
     vba_summary = ""
@@ -177,7 +183,7 @@ def create_plan_prompt(analysis_dict: dict) -> str:
 - Complexity: {complexity}
 - Has VBA: {"Yes" if has_vba else "No"}
 
-{''.join(sheet_summaries)}
+{buf.getvalue()}
 {vba_summary}
 {print_summary}
 
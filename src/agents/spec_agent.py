@@ -7,8 +7,15 @@ Instead of creating a WebAppPlan, it creates a WebAppSpec that:
 3. Includes boundary conditions for thorough testing
 """
 
-from agents import Agent, AgentOutputSchema
+import io
+import re
+from collections import defaultdict, deque
+from functools import lru_cache
+from itertools import islice
 
+from agents import Agent, AgentOutputSchema, ModelSettings
+
+from src.agents._summary import render_sheet_header
 from src.models import WebAppSpec
 
 
@@ -151,17 +158,80 @@ Be thorough - the Test Generator will use this spec to create failing tests.
 """
 
 
+_SPEC_SCHEMA = AgentOutputSchema(WebAppSpec, strict_json_schema=False)
+
+
+@lru_cache(maxsize=1)
 def create_spec_agent() -> Agent:
-    """Create the Spec Agent instance for TDD pipeline."""
+    """Create the Spec Agent instance for TDD pipeline (built once and shared)."""
     return Agent(
         name="TDD Spec Architect",
         instructions=SPEC_AGENT_INSTRUCTIONS,
         tools=[],  # No tools - pure LLM reasoning
         model="gpt-5.2",  # SOTA model for complex reasoning
-        output_type=AgentOutputSchema(WebAppSpec, strict_json_schema=False),
+        # Stable key so the static instructions prefix hits the prompt cache
+        model_settings=ModelSettings(extra_args={"prompt_cache_key": "excel2web-spec"}),
+        output_type=_SPEC_SCHEMA,
     )
 
 
+def _iter_formulas(sheets: list[dict]):
+    """Yield (sheet_name, cell, formula) across sheets in order."""
+    for sheet in sheets:
+        name = sheet["name"]
+        for f in sheet.get("formulas", []):
+            yield name, f["cell"], f["formula"]
+
+
+# Fallback when a formula entry carries no precomputed dependencies
+_CELL_RE = re.compile(r"\$?([A-Z]+)\$?(\d+)")
+
+
+def _calculation_order(sheets: list[dict]) -> tuple[list[tuple[str, str, str]], list[str]]:
+    """
+    Order formula cells so every formula follows the formulas it reads (Kahn).
+
+    Dependencies are per sheet (the analyzer strips sheet prefixes), and only
+    edges between formula cells matter; plain inputs impose no order.
+
+    Returns:
+        ((sheet, cell, formula) in calculation order, cyclic "Sheet!Cell" list)
+    """
+    ordered = []
+    cyclic = []
+    for sheet in sheets:
+        name = sheet["name"]
+        entries = sheet.get("formulas", [])
+        formulas = {f["cell"]: f["formula"] for f in entries}
+        if not formulas:
+            continue
+
+        in_degree = {}
+        dependents = defaultdict(list)
+        for f in entries:
+            refs = f.get("dependencies")
+            if refs is None:
+                refs = [col + row for col, row in _CELL_RE.findall(f["formula"].upper())]
+            refs = {ref for ref in refs if ref in formulas}
+            in_degree[f["cell"]] = len(refs)
+            for ref in refs:
+                dependents[ref].append(f["cell"])
+
+        # Seed in sheet order so independent formulas keep their layout order
+        queue = deque(cell for cell in formulas if in_degree[cell] == 0)
+        while queue:
+            cell = queue.popleft()
+            ordered.append((name, cell, formulas[cell]))
+            for dependent in dependents[cell]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        # Kahn leaves every cell on (or downstream of) a cycle unvisited
+        cyclic.extend(f"{name}!{cell}" for cell, degree in in_degree.items() if degree > 0)
+    return ordered, cyclic
+
+
 def create_spec_prompt(analysis_dict: dict) -> str:
     """
     Create a prompt for the Spec Agent.
@@ -179,31 +249,38 @@ def create_spec_prompt(analysis_dict: dict) -> str:
     print_settings = analysis_dict.get("print_settings", {})
 
     # Build sheet summaries with formula details
-    sheet_summaries = []
-    all_formulas = []
+    buf = io.StringIO()
+    write = buf.write
 
     for sheet in sheets:
-        sheet_summaries.append(f"""
-### Sheet: {sheet['name']}
-- Dimensions: {sheet['row_count']} rows × {sheet['col_count']} cols
-- Used range: {sheet['used_range']}
-- Input cells ({len(sheet['input_cells'])}): {', '.join(sheet['input_cells'][:10])}{'...' if len(sheet['input_cells']) > 10 else ''}
-- Output cells ({len(sheet['output_cells'])}): {', '.join(sheet['output_cells'][:10])}{'...' if len(sheet['output_cells']) > 10 else ''}
-""")
-        # Collect formulas for testing
-        for f in sheet.get("formulas", []):
-            all_formulas.append({
-                "sheet": sheet["name"],
-                "cell": f["cell"],
-                "formula": f["formula"],
-            })
-
-    # Format formulas
-    formula_section = "\n## Formulas to Convert\n"
-    for f in all_formulas[:20]:
-        formula_section += f"- {f['sheet']}!{f['cell']}: `{f['formula']}`\n"
-    if len(all_formulas) > 20:
-        formula_section += f"... and {len(all_formulas) - 20} more\n"
+        write(render_sheet_header(sheet))
+
+    # Format formulas (only the first 20 are materialized; the rest are counted)
+    formula_lines = [
+        f"- {sheet_name}!{cell}: `{formula}`\n"
+        for sheet_name, cell, formula in islice(_iter_formulas(sheets), 20)
+    ]
+    total_formulas = sum(len(sheet.get("formulas", [])) for sheet in sheets)
+    if total_formulas > 20:
+        formula_lines.append(f"... and {total_formulas - 20} more\n")
+    formula_section = "\n## Formulas to Convert\n" + "".join(formula_lines)
+
+    # Precomputed dependency order so the model does not re-derive it
+    calc_order, cyclic = _calculation_order(sheets)
+    order_section = ""
+    if calc_order:
+        order_lines = [
+            f"{i}. {sheet_name}!{cell} ({formula})\n"
+            for i, (sheet_name, cell, formula) in enumerate(islice(calc_order, 20), 1)
+        ]
+        if len(calc_order) > 20:
+            order_lines.append(f"... and {len(calc_order) - 20} more\n")
+        order_section = "\n## Suggested Calculation Order\n" + "".join(order_lines)
+    if cyclic:
+        cyclic_list = ", ".join(islice(cyclic, 20))
+        if len(cyclic) > 20:
+            cyclic_list += f", ... and {len(cyclic) - 20} more"
+        order_section += f"\n## Cyclic formulas detected ({len(cyclic)}): {cyclic_list}\n"
 
     # VBA summary
     vba_summary = ""
@@ -227,8 +304,9 @@ def create_spec_prompt(analysis_dict: dict) -> str:
 - Filename: {filename}
 - Has VBA: {"Yes" if has_vba else "No"}
 
-{''.join(sheet_summaries)}
+{buf.getvalue()}
 {formula_section}
+{order_section}
 {vba_summary}
 {print_summary}
 
@@ -11,12 +11,16 @@ Unlike simple extraction, this agent UNDERSTANDS the formulas and generates
 meaningful test cases that verify the JS conversion accuracy.
 """
 
-import json
+import math
+import re
+from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from pydantic import BaseModel, Field
 
 from agents import Agent, function_tool, AgentOutputSchema
 
+from src._json import json_dumps as _dumps, json_loads as _loads
 from src.models import ExcelAnalysis, FormulaInfo
 from src.models.test_case import (
     FormulaTestCase,
@@ -66,6 +70,59 @@ class GeneratedTestSuite(BaseModel):
     )
 
 
+# =============================================================================
+# VBA Patterns
+# =============================================================================
+
+_IF_RE = re.compile(r'If\s+(.+?)\s+Then', re.IGNORECASE)
+# Numeric operand of a comparison (boundary value)
+_NUM_IN_COND_RE = re.compile(r'[<>=]+\s*(\d+(?:\.\d+)?)')
+# variable = expression containing an arithmetic operator
+_ASSIGN_RE = re.compile(r'(\w+)\s*=\s*([^\'"\n]+(?:\*|\/|\+|\-|\^)[^\'"\n]+)')
+_CONST_RE = re.compile(r'\b(\d+(?:\.\d+)?)\b')
+# First letters of every construct analyze_vba_logic looks for (Function/Sub,
+# If, Select Case, For/Do/While, On Error); code without any of them has
+# nothing to analyze
+_VBA_KEYWORD_CHARS = frozenset("FfSsIiDWO")
+# Upper-cased keyword -> semantic summary, checked in order by
+# analyze_formula_semantics ("평균" is unchanged by upper())
+_SEMANTIC_SUM = "This formula calculates the SUM of values. Needs tests for: empty values, negative numbers, large numbers, mixed types."
+_SEMANTIC_IF = "This is a conditional formula. Needs tests for: true condition, false condition, edge cases at boundaries."
+_SEMANTIC_LOOKUP = "This is a lookup formula. Needs tests for: exact match, not found, first/last item."
+_SEMANTIC_ROUND = "This formula rounds numbers. Needs tests for: .5 rounding, negative numbers, already rounded."
+_SEMANTIC_MINMAX = "This finds max/min value. Needs tests for: single value, all same, negative values."
+_SEMANTIC_AVERAGE = "This calculates average. Needs tests for: single value, zero sum, large dataset."
+_FORMULA_SEMANTICS = (
+    ("SUM", _SEMANTIC_SUM),
+    ("IF", _SEMANTIC_IF),
+    ("VLOOKUP", _SEMANTIC_LOOKUP),
+    ("HLOOKUP", _SEMANTIC_LOOKUP),
+    ("ROUND", _SEMANTIC_ROUND),
+    ("MAX", _SEMANTIC_MINMAX),
+    ("MIN", _SEMANTIC_MINMAX),
+    ("AVERAGE", _SEMANTIC_AVERAGE),
+    ("평균", _SEMANTIC_AVERAGE),
+)
+
+# Arithmetic operator -> operation name, in reporting order
+_OPERATIONS = (
+    ("*", "multiplication"),
+    ("/", "division"),
+    ("+", "addition"),
+    ("-", "subtraction"),
+    ("^", "exponentiation"),
+)
+
+
+@lru_cache(maxsize=256)
+def _func_sig_re(procedure_name: str) -> re.Pattern:
+    """Compiled Function/Sub signature pattern for a procedure name."""
+    return re.compile(
+        r'(?:Function|Sub)\s+' + re.escape(procedure_name) + r'\s*\(([^)]*)\)',
+        re.IGNORECASE,
+    )
+
+
 # =============================================================================
 # Agent Tools
 # =============================================================================
@@ -92,8 +149,6 @@ def analyze_vba_logic(
     Returns:
         JSON analysis of the VBA logic with test recommendations
     """
-    import re
-
     analysis = {
         "procedure_name": procedure_name,
         "parameters": [],
@@ -103,9 +158,11 @@ def analyze_vba_logic(
         "test_recommendations": [],
     }
 
+    if _VBA_KEYWORD_CHARS.isdisjoint(vba_code):
+        return _dumps(analysis, indent=True)
+
     # Extract parameters from Function/Sub declaration
-    func_pattern = r'(?:Function|Sub)\s+' + re.escape(procedure_name) + r'\s*\(([^)]*)\)'
-    func_match = re.search(func_pattern, vba_code, re.IGNORECASE)
+    func_match = _func_sig_re(procedure_name).search(vba_code)
     if func_match:
         params_str = func_match.group(1)
         # Parse parameters
@@ -121,24 +178,10 @@ def analyze_vba_logic(
                     "type": param_type,
                 })
 
-    # Extract If conditions and boundary values
-    if_pattern = r'If\s+(.+?)\s+Then'
-    elseif_pattern = r'ElseIf\s+(.+?)\s+Then'
-
-    for pattern in [if_pattern, elseif_pattern]:
-        for match in re.finditer(pattern, vba_code, re.IGNORECASE):
-            condition = match.group(1).strip()
-            analysis["conditions"].append(condition)
-
-            # Extract numeric boundary values
-            num_pattern = r'[<>=]+\s*(\d+(?:\.\d+)?)'
-            for num_match in re.finditer(num_pattern, condition):
-                value = float(num_match.group(1))
-                if value not in analysis["boundary_values"]:
-                    analysis["boundary_values"].append(value)
-
-    # Sort boundary values for test generation
-    analysis["boundary_values"].sort()
+    # Extract If conditions and boundary values (sorted for test generation)
+    conditions, boundary_values = _scan_conditions(vba_code)
+    analysis["conditions"] = list(conditions)
+    analysis["boundary_values"] = list(boundary_values)
 
     # Generate test recommendations based on conditions
     if analysis["conditions"]:
@@ -163,7 +206,75 @@ def analyze_vba_logic(
     if 'On Error' in vba_code:
         analysis["test_recommendations"].append("에러 핸들링 테스트: 잘못된 입력, 0으로 나누기 등")
 
-    return json.dumps(analysis, ensure_ascii=False, indent=2)
+    return _dumps(analysis, indent=True)
+
+
+# The agent typically calls analyze_vba_logic and generate_vba_test_cases on
+# the same procedure source, so both scans are memoized on the code text.
+@lru_cache(maxsize=128)
+def _scan_conditions(vba_code: str) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """
+    If/ElseIf conditions and the sorted numeric boundaries compared in them.
+
+    Every ElseIf clause also matches _IF_RE (at its "If"), so ElseIf
+    conditions are recognized by the preceding "Else" and listed again after
+    the If conditions, as a separate ElseIf pass would. Code without a literal
+    "If ... Then" skips the scan entirely.
+    """
+    lowered = vba_code.lower()
+    conditions = []
+    elseif_conditions = []
+    boundary_values = set()
+    if "then" in lowered and "if" in lowered:
+        for match in _IF_RE.finditer(vba_code):
+            condition = match.group(1).strip()
+            conditions.append(condition)
+            start = match.start()
+            if start >= 4 and lowered[start - 4:start] == "else":
+                elseif_conditions.append(condition)
+
+            boundary_values.update(
+                float(num_match.group(1))
+                for num_match in _NUM_IN_COND_RE.finditer(condition)
+            )
+    conditions.extend(elseif_conditions)
+    return tuple(conditions), tuple(sorted(boundary_values))
+
+
+@lru_cache(maxsize=128)
+def _extract_boundaries(vba_code: str) -> tuple[float, ...]:
+    """Sorted numeric operands of every comparison/assignment in the code."""
+    if "<" not in vba_code and ">" not in vba_code and "=" not in vba_code:
+        return ()
+    return tuple(sorted({
+        float(match.group(1)) for match in _NUM_IN_COND_RE.finditer(vba_code)
+    }))
+
+
+def _boundary_triplet(boundary: float, param: Optional[str]) -> tuple[dict, dict, dict]:
+    """Test cases at, just below and just above a boundary value."""
+    below = boundary - 1
+    above = boundary + 1
+    return (
+        {
+            "name": f"경계값 정확히 {int(boundary):,}",
+            "type": "boundary",
+            "inputs": {param: boundary} if param is not None else {},
+            "description": f"경계값 {boundary}에서의 동작 검증",
+        },
+        {
+            "name": f"경계값 미만 {int(below):,}",
+            "type": "boundary",
+            "inputs": {param: below} if param is not None else {},
+            "description": f"경계값 {boundary} 바로 아래에서의 동작",
+        },
+        {
+            "name": f"경계값 초과 {int(above):,}",
+            "type": "boundary",
+            "inputs": {param: above} if param is not None else {},
+            "description": f"경계값 {boundary} 바로 위에서의 동작",
+        },
+    )
 
 
 @function_tool
@@ -189,46 +300,19 @@ def generate_vba_test_cases(
     Returns:
         JSON array of test cases
     """
-    import re
-
     params = [p.strip() for p in parameter_names.split(',')]
     test_cases = []
 
     # Extract boundary values from conditions
-    boundary_values = []
-    condition_pattern = r'[<>=]+\s*(\d+(?:\.\d+)?)'
-    for match in re.finditer(condition_pattern, vba_code):
-        value = float(match.group(1))
-        if value not in boundary_values:
-            boundary_values.append(value)
-
-    boundary_values.sort()
-
-    # Generate boundary tests
-    for boundary in boundary_values:
-        # Test exactly at boundary
-        test_cases.append({
-            "name": f"경계값 정확히 {int(boundary):,}",
-            "type": "boundary",
-            "inputs": {params[0]: boundary} if params else {},
-            "description": f"경계값 {boundary}에서의 동작 검증",
-        })
-
-        # Test just below boundary
-        test_cases.append({
-            "name": f"경계값 미만 {int(boundary-1):,}",
-            "type": "boundary",
-            "inputs": {params[0]: boundary - 1} if params else {},
-            "description": f"경계값 {boundary} 바로 아래에서의 동작",
-        })
-
-        # Test just above boundary
-        test_cases.append({
-            "name": f"경계값 초과 {int(boundary+1):,}",
-            "type": "boundary",
-            "inputs": {params[0]: boundary + 1} if params else {},
-            "description": f"경계값 {boundary} 바로 위에서의 동작",
-        })
+    boundary_values = _extract_boundaries(vba_code)
+
+    # Generate boundary tests: exactly at, just below and just above each boundary
+    first_param = params[0] if params else None
+    test_cases.extend(
+        case
+        for boundary in boundary_values
+        for case in _boundary_triplet(boundary, first_param)
+    )
 
     # Add edge case tests
     test_cases.extend([
@@ -263,7 +347,7 @@ def generate_vba_test_cases(
                 "description": f"{int(boundary_values[i]):,}~{int(boundary_values[i+1]):,} 구간 중간값",
             })
 
-    return json.dumps(test_cases, ensure_ascii=False, indent=2)
+    return _dumps(test_cases, indent=True)
 
 
 @function_tool
@@ -284,15 +368,12 @@ def extract_calculation_logic(
     Returns:
         JSON with extracted calculations and verification points
     """
-    import re
-
     calculations = []
 
-    # Find assignment statements with calculations
-    # Pattern: variable = expression
-    assign_pattern = r'(\w+)\s*=\s*([^\'"\n]+(?:\*|\/|\+|\-|\^)[^\'"\n]+)'
-
-    for match in re.finditer(assign_pattern, vba_code):
+    # Find assignment statements with calculations (variable = expression);
+    # without "=" and an arithmetic operator there is nothing to match
+    has_arithmetic = "=" in vba_code and any(op in vba_code for op in "*/+-^")
+    for match in (_ASSIGN_RE.finditer(vba_code) if has_arithmetic else ()):
         var_name = match.group(1).strip()
         expression = match.group(2).strip()
 
@@ -300,41 +381,30 @@ def extract_calculation_logic(
         if any(op in expression for op in ['<', '>', '<=', '>=', '<>']):
             continue
 
+        # Identify operations (one scan of the expression)
+        present = set(expression)
         calculations.append({
             "variable": var_name,
             "expression": expression,
-            "operations": [],
+            "operations": [name for op, name in _OPERATIONS if op in present],
         })
 
-        # Identify operations
-        if '*' in expression:
-            calculations[-1]["operations"].append("multiplication")
-        if '/' in expression:
-            calculations[-1]["operations"].append("division")
-        if '+' in expression:
-            calculations[-1]["operations"].append("addition")
-        if '-' in expression:
-            calculations[-1]["operations"].append("subtraction")
-        if '^' in expression:
-            calculations[-1]["operations"].append("exponentiation")
-
     # Extract numeric constants for verification
-    constants = []
-    const_pattern = r'\b(\d+(?:\.\d+)?)\b'
-    for match in re.finditer(const_pattern, vba_code):
+    constants = set()
+    for match in _CONST_RE.finditer(vba_code):
         value = float(match.group(1))
-        if value > 0 and value not in constants:
-            constants.append(value)
+        if value > 0:
+            constants.add(value)
 
-    return json.dumps({
+    return _dumps({
         "calculations": calculations,
-        "constants": sorted(set(constants)),
+        "constants": sorted(constants),
         "verification_points": [
             "각 계산 결과가 JS 변환 후에도 동일한지 확인",
             "부동소수점 정밀도 검증 (특히 나눗셈, 백분율)",
             "정수 오버플로우 확인 (큰 숫자 곱셈)",
         ],
-    }, ensure_ascii=False, indent=2)
+    }, indent=True)
 
 
 @function_tool
@@ -356,25 +426,16 @@ def analyze_formula_semantics(
     """
     formula_upper = formula.upper()
 
-    # Detect formula type
-    if "SUM" in formula_upper:
-        return f"This formula calculates the SUM of values. Needs tests for: empty values, negative numbers, large numbers, mixed types."
-    elif "IF" in formula_upper:
-        return f"This is a conditional formula. Needs tests for: true condition, false condition, edge cases at boundaries."
-    elif "VLOOKUP" in formula_upper or "HLOOKUP" in formula_upper:
-        return f"This is a lookup formula. Needs tests for: exact match, not found, first/last item."
-    elif "ROUND" in formula_upper:
-        return f"This formula rounds numbers. Needs tests for: .5 rounding, negative numbers, already rounded."
-    elif "MAX" in formula_upper or "MIN" in formula_upper:
-        return f"This finds max/min value. Needs tests for: single value, all same, negative values."
-    elif "AVERAGE" in formula_upper or "평균" in formula:
-        return f"This calculates average. Needs tests for: single value, zero sum, large dataset."
-    elif "*" in formula and ("%" in formula or "0.0" in formula):
+    # Detect formula type (first matching keyword wins)
+    for keyword, message in _FORMULA_SEMANTICS:
+        if keyword in formula_upper:
+            return message
+
+    if "*" in formula and ("%" in formula or "0.0" in formula):
         return f"This appears to be a percentage/rate calculation. Needs tests for: 0%, 100%, boundary rates."
-    elif "-" in formula:
+    if "-" in formula:
         return f"This is a subtraction/difference formula. Needs tests for: equal values (=0), negative result."
-    else:
-        return f"Generic calculation formula. Generate standard numeric test cases."
+    return f"Generic calculation formula. Generate standard numeric test cases."
 
 
 @function_tool
@@ -395,8 +456,8 @@ def generate_boundary_values(
         JSON array of boundary test cases
     """
     try:
-        values = json.loads(current_values)
-    except:
+        values = _loads(current_values)
+    except ValueError:
         values = {}
 
     cells = [c.strip() for c in input_cells.split(",")]
@@ -435,7 +496,7 @@ def generate_boundary_values(
         "type": "boundary",
     })
 
-    return json.dumps(boundary_cases, ensure_ascii=False)
+    return _dumps(boundary_cases)
 
 
 @function_tool
@@ -456,8 +517,8 @@ def generate_business_scenario(
         JSON object with business scenario test
     """
     try:
-        values = json.loads(sample_values)
-    except:
+        values = _loads(sample_values)
+    except ValueError:
         values = {}
 
     scenarios = {
@@ -485,11 +546,11 @@ def generate_business_scenario(
 
     domain_scenarios = scenarios.get(domain, scenarios["default"])
 
-    return json.dumps({
+    return _dumps({
         "domain": domain,
         "scenarios": domain_scenarios,
         "sample_values": values,
-    }, ensure_ascii=False)
+    })
 
 
 @function_tool
@@ -518,8 +579,8 @@ def create_test_case(
         JSON string of the test case
     """
     try:
-        inputs = json.loads(inputs_json)
-    except:
+        inputs = _loads(inputs_json)
+    except ValueError:
         inputs = {}
 
     test_case = GeneratedTestCase(
@@ -531,7 +592,7 @@ def create_test_case(
         expected_output=expected_output,
     )
 
-    return test_case.model_dump_json(indent=2)
+    return _dumps(test_case.model_dump(mode="json"), indent=True)
 
 
 @function_tool
@@ -553,16 +614,20 @@ def calculate_expected_output(
         Calculated result or estimation guidance
     """
     try:
-        inputs = json.loads(inputs_json)
-    except:
+        inputs = _loads(inputs_json)
+    except ValueError:
         return "Error: Invalid inputs JSON"
 
-    formula_upper = formula.upper()
-
-    # Simple SUM
-    if formula_upper.startswith("=SUM"):
+    # Simple SUM (math.fsum: exactly rounded, so no float accumulation error).
+    # Only the head needs case-folding, not the whole formula.
+    if formula[:4].upper() == "=SUM":
         try:
-            total = sum(float(v) for v in inputs.values() if isinstance(v, (int, float)))
+            vals = tuple(inputs.values())
+            try:
+                total = math.fsum(vals) if vals else 0
+            except TypeError:
+                # Non-numeric values present; sum only the numbers
+                total = math.fsum(v for v in vals if isinstance(v, (int, float)))
             return f"SUM result: {total}"
         except:
             return "Cannot calculate SUM - check input types"
@@ -570,8 +635,8 @@ def calculate_expected_output(
     # Simple multiplication
     if "*" in formula and len(inputs) == 2:
         try:
-            vals = list(inputs.values())
-            result = float(vals[0]) * float(vals[1])
+            first, second = inputs.values()
+            result = float(first) * float(second)
             return f"Multiplication result: {result}"
         except:
             pass
@@ -579,7 +644,7 @@ def calculate_expected_output(
     # Simple addition
     if "+" in formula and "-" not in formula:
         try:
-            total = sum(float(v) for v in inputs.values())
+            total = math.fsum(float(v) for v in inputs.values())
             return f"Addition result: {total}"
         except:
             pass
@@ -651,8 +716,12 @@ Focus on generating MEANINGFUL tests that will catch real bugs in the JS convers
 # Agent Creation
 # =============================================================================
 
+_TEST_SUITE_SCHEMA = AgentOutputSchema(GeneratedTestSuite, strict_json_schema=False)
+
+
+@lru_cache(maxsize=1)
 def create_test_generator_agent() -> Agent:
-    """Create the Test Generator Agent."""
+    """Create the Test Generator Agent (built once and shared)."""
     return Agent(
         name="Test Generator",
         instructions=TEST_GENERATOR_INSTRUCTIONS,
@@ -664,10 +733,20 @@ def create_test_generator_agent() -> Agent:
             calculate_expected_output,
         ],
         model="gpt-5-mini",  # Cost-optimized for test generation
-        output_type=AgentOutputSchema(GeneratedTestSuite, strict_json_schema=False),
+        output_type=_TEST_SUITE_SCHEMA,
     )
 
 
+# Filename keywords -> business domain, checked in order
+_DOMAIN_TABLE = (
+    ("세금계산", ("세금", "소득세", "부가세")),
+    ("급여계산", ("급여", "연봉", "임금")),
+    ("할인계산", ("할인", "쿠폰")),
+    ("이자계산", ("이자", "대출")),
+    ("거래계산", ("영수증", "거래")),
+)
+
+
 def create_test_generation_prompt(
     analysis: ExcelAnalysis,
     max_formulas: int = 20,
@@ -683,30 +762,28 @@ def create_test_generation_prompt(
         Prompt string for the agent
     """
     # Collect formulas
-    formulas = []
-    for sheet in analysis.sheets:
-        for formula in sheet.formulas[:max_formulas]:
-            formulas.append({
-                "sheet": sheet.name,
-                "cell": formula.cell,
-                "formula": formula.formula,
-                "dependencies": formula.dependencies,
-                "result_type": formula.result_type,
-            })
+    formulas = [
+        {
+            "sheet": sheet.name,
+            "cell": formula.cell,
+            "formula": formula.formula,
+            "dependencies": formula.dependencies,
+            "result_type": formula.result_type,
+        }
+        for sheet in analysis.sheets
+        for formula in sheet.formulas[:max_formulas]
+    ]
 
     # Detect domain from filename
-    domain = "일반계산"
     filename_lower = analysis.filename.lower()
-    if "세금" in filename_lower or "소득세" in filename_lower or "부가세" in filename_lower:
-        domain = "세금계산"
-    elif "급여" in filename_lower or "연봉" in filename_lower or "임금" in filename_lower:
-        domain = "급여계산"
-    elif "할인" in filename_lower or "쿠폰" in filename_lower:
-        domain = "할인계산"
-    elif "이자" in filename_lower or "대출" in filename_lower:
-        domain = "이자계산"
-    elif "영수증" in filename_lower or "거래" in filename_lower:
-        domain = "거래계산"
+    domain = next(
+        (
+            name
+            for name, keywords in _DOMAIN_TABLE
+            if any(keyword in filename_lower for keyword in keywords)
+        ),
+        "일반계산",
+    )
 
     prompt = f"""# Excel 파일 분석 결과
 
@@ -719,7 +796,7 @@ def create_test_generation_prompt(
 - 출력 셀 수: {analysis.total_output_cells}
 
 ## 분석할 수식 목록
-{json.dumps(formulas, indent=2, ensure_ascii=False)}
+{_dumps(formulas, indent=True)}
 
 ## 요청사항
 위 수식들에 대해 다음 테스트 케이스를 생성해주세요:
@@ -753,19 +830,20 @@ def convert_to_static_test_suite(
     Returns:
         StaticTestSuite compatible with the test runner
     """
-    from datetime import datetime
-
-    formula_tests = []
-    for tc in generated.test_cases:
-        formula_tests.append(FormulaTestCase(
+    # expected_output is validated as float | int | str, so anything that is
+    # not a string is numeric
+    formula_tests = [
+        FormulaTestCase(
             formula_cell=tc.formula_cell,
             formula=f"Generated: {tc.name}",
             input_values=tc.inputs,
             expected_output=tc.expected_output,
-            expected_type="number" if isinstance(tc.expected_output, (int, float)) else "string",
+            expected_type="string" if isinstance(tc.expected_output, str) else "number",
             tolerance=tc.tolerance,
             description=tc.description,
-        ))
+        )
+        for tc in generated.test_cases
+    ]
 
     scenarios = []
     for sc in generated.scenarios:
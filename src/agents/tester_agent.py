@@ -1,5 +1,7 @@
 """Tester Agent - LLM-as-a-Judge pattern for evaluating generated code."""
 
+import json
+import re
 from typing import Literal
 from pydantic import BaseModel, Field
 
@@ -67,21 +69,23 @@ def validate_html_structure(html: str) -> dict:
         if tag not in html:
             issues.append(f"Missing {tag} tag")
 
+    # Case-insensitive checks share one lowercased copy
+    lowered = html.lower()
+
     # Check for Bootstrap
-    if "bootstrap" not in html.lower():
+    if "bootstrap" not in lowered:
         issues.append("Bootstrap CSS not included")
 
     # Check for Alpine.js
-    if "alpine" not in html.lower():
+    if "alpine" not in lowered:
         issues.append("Alpine.js not included")
 
     # Check balanced tags
-    tag_pairs = [("div", "div"), ("script", "script"), ("style", "style")]
-    for open_tag, close_tag in tag_pairs:
-        open_count = html.lower().count(f"<{open_tag}")
-        close_count = html.lower().count(f"</{close_tag}>")
+    for tag in ("div", "script", "style"):
+        open_count = lowered.count(f"<{tag}")
+        close_count = lowered.count(f"</{tag}>")
         if open_count != close_count:
-            issues.append(f"Unbalanced <{open_tag}> tags: {open_count} open, {close_count} close")
+            issues.append(f"Unbalanced <{tag}> tags: {open_count} open, {close_count} close")
 
     return {
         "valid": len(issues) == 0,
@@ -89,6 +93,14 @@ def validate_html_structure(html: str) -> dict:
     }
 
 
+# (open, close, label) for validate_javascript_syntax balance checks
+_JS_PAIRS = (
+    ("{", "}", "curly braces"),
+    ("(", ")", "parentheses"),
+    ("[", "]", "brackets"),
+)
+
+
 @function_tool
 def validate_javascript_syntax(js_code: str) -> dict:
     """
@@ -102,27 +114,17 @@ def validate_javascript_syntax(js_code: str) -> dict:
     """
     issues = []
 
-    # Check balanced braces
-    if js_code.count("{") != js_code.count("}"):
-        issues.append(f"Unbalanced curly braces: {js_code.count('{')} open, {js_code.count('}')} close")
-
-    # Check balanced parentheses
-    if js_code.count("(") != js_code.count(")"):
-        issues.append(f"Unbalanced parentheses: {js_code.count('(')} open, {js_code.count(')')} close")
-
-    # Check balanced brackets
-    if js_code.count("[") != js_code.count("]"):
-        issues.append(f"Unbalanced brackets: {js_code.count('[')} open, {js_code.count(']')} close")
+    # Check balanced braces, parentheses and brackets (each side counted once)
+    for open_char, close_char, label in _JS_PAIRS:
+        open_count = js_code.count(open_char)
+        close_count = js_code.count(close_char)
+        if open_count != close_count:
+            issues.append(f"Unbalanced {label}: {open_count} open, {close_count} close")
 
     # Check for appData function (Alpine.js data)
     if "appData" not in js_code and "function" not in js_code:
         issues.append("Missing appData() or main function definition")
 
-    # Check for common errors
-    if "undefined" in js_code.lower() and "=== undefined" not in js_code:
-        # This might be intentional, just a warning
-        pass
-
     return {
         "valid": len(issues) == 0,
         "issues": issues,
@@ -150,8 +152,8 @@ def validate_print_styles(css_or_html: str) -> dict:
     if "@page" not in css_or_html:
         issues.append("Missing @page rule for page size/margins")
 
-    # Check for no-print class
-    if "no-print" not in css_or_html and ".no-print" not in css_or_html:
+    # Check for no-print class (".no-print" contains "no-print")
+    if "no-print" not in css_or_html:
         issues.append("Missing .no-print class to hide interactive elements when printing")
 
     return {
@@ -160,6 +162,10 @@ def validate_print_styles(css_or_html: str) -> dict:
     }
 
 
+# Hangul syllables block (U+AC00-U+D7A3)
+_HANGUL_RE = re.compile("[\uac00-\ud7a3]")
+
+
 @function_tool
 def validate_korean_ui(html: str) -> dict:
     """
@@ -174,12 +180,7 @@ def validate_korean_ui(html: str) -> dict:
     issues = []
 
     # Check for Korean characters (Hangul range: AC00-D7A3)
-    has_korean = any(
-        ord(char) >= 0xAC00 and ord(char) <= 0xD7A3
-        for char in html
-    )
-
-    if not has_korean:
+    if not _HANGUL_RE.search(html):
         issues.append("No Korean text found in UI labels")
 
     # Check for common Korean UI elements
@@ -200,6 +201,16 @@ def validate_korean_ui(html: str) -> dict:
     }
 
 
+# check_formula_implementation reason per detected formula kind
+_FOUND_REASONS = {
+    "sum": "SUM logic found",
+    "if": "IF logic found",
+    "vlookup": "VLOOKUP logic found",
+    "arithmetic": "Arithmetic operations found",
+    "generic": "Calculation logic present",
+}
+
+
 @function_tool
 def check_formula_implementation(
     js_code: str,
@@ -215,57 +226,50 @@ def check_formula_implementation(
     Returns:
         Dict with implementation status for each formula
     """
-    import json as json_module
-
     try:
-        formulas = json_module.loads(formula_list)
-    except (json_module.JSONDecodeError, TypeError):
+        formulas = json.loads(formula_list)
+    except (json.JSONDecodeError, TypeError):
         # If not valid JSON, try to parse as simple format
         formulas = []
 
+    # What the generated code contains does not depend on the formula, so
+    # scan js_code once per pattern family up front
+    js_lower = js_code.lower()
+    js_has = {
+        "sum": "reduce" in js_code or ".sum" in js_code or "+ " in js_code,
+        "if": "?" in js_code or "if " in js_lower or "if(" in js_lower,
+        "vlookup": "find" in js_lower or "filter" in js_lower or "lookup" in js_lower,
+        "arithmetic": any(op in js_code for op in ("+", "-", "*", "/")),
+        "generic": "return" in js_code and ("+" in js_code or "*" in js_code or "get" in js_code),
+    }
+
     results = []
 
     for formula_info in formulas[:10]:  # Check first 10
-        cell = formula_info.get("cell", "") if isinstance(formula_info, dict) else ""
-        formula = formula_info.get("formula", "") if isinstance(formula_info, dict) else ""
+        if isinstance(formula_info, dict):
+            cell = formula_info.get("cell", "")
+            formula = formula_info.get("formula", "")
+        else:
+            cell = formula = ""
 
         # Check if formula logic appears to be implemented
         # Look for related function names or calculations
         formula_lower = formula.lower()
 
-        implemented = False
-        reason = "Not found in generated code"
-
-        # Check for SUM
         if "sum(" in formula_lower:
-            if "reduce" in js_code or ".sum" in js_code or "+ " in js_code:
-                implemented = True
-                reason = "SUM logic found"
-
-        # Check for IF
+            kind = "sum"
         elif "if(" in formula_lower:
-            if "?" in js_code or "if " in js_code.lower() or "if(" in js_code.lower():
-                implemented = True
-                reason = "IF logic found"
-
-        # Check for VLOOKUP
+            kind = "if"
         elif "vlookup(" in formula_lower:
-            if "find" in js_code.lower() or "filter" in js_code.lower() or "lookup" in js_code.lower():
-                implemented = True
-                reason = "VLOOKUP logic found"
-
-        # Check for basic arithmetic
-        elif any(op in formula for op in ["+", "-", "*", "/"]):
-            if any(op in js_code for op in ["+", "-", "*", "/"]):
-                implemented = True
-                reason = "Arithmetic operations found"
-
-        # Generic check - look for cell reference pattern
+            kind = "vlookup"
+        elif any(op in formula for op in ("+", "-", "*", "/")):
+            kind = "arithmetic"
         else:
-            # Just check if there's some calculation logic
-            if "return" in js_code and ("+" in js_code or "*" in js_code or "get" in js_code):
-                implemented = True
-                reason = "Calculation logic present"
+            # Generic check - just look for some calculation logic
+            kind = "generic"
+
+        implemented = js_has[kind]
+        reason = _FOUND_REASONS[kind] if implemented else "Not found in generated code"
 
         results.append({
             "cell": cell,
@@ -347,6 +351,9 @@ Be thorough but fair. After 3-5 improvement iterations, if the code is "good eno
 """
 
 
+_EVALUATION_SCHEMA = AgentOutputSchema(TestEvaluation, strict_json_schema=False)
+
+
 def create_tester_agent() -> Agent:
     """Create the Tester Agent instance."""
     return Agent(
@@ -360,10 +367,21 @@ def create_tester_agent() -> Agent:
             check_formula_implementation,
         ],
         model="gpt-5-mini",  # Cost-optimized for evaluation
-        output_type=AgentOutputSchema(TestEvaluation, strict_json_schema=False),
+        output_type=_EVALUATION_SCHEMA,
     )
 
 
+# Formulas listed in the tester prompt; the rest are summarized as "... and more"
+_PROMPT_FORMULA_LIMIT = 15
+
+
+def _clip(code: str, limit: int) -> str:
+    """Code cut to limit characters, followed by a truncation marker line."""
+    if len(code) <= limit:
+        return code + "\n"
+    return code[:limit] + "\n... [truncated]"
+
+
 def create_test_prompt(
     html: str,
     css: str,
@@ -384,31 +402,36 @@ def create_test_prompt(
     Returns:
         Prompt string for the tester
     """
+    shown = formulas[:_PROMPT_FORMULA_LIMIT]
+    formula_lines = "\n".join([f"- {f['cell']}: {f['formula']}" for f in shown])
+    more = "... and more" if len(formulas) > len(shown) else ""
+    lenient = (
+        f"Note: This is iteration {iteration}. Be lenient if code is functional but not perfect."
+        if iteration >= 3 else ""
+    )
+
     return f"""# Code Evaluation Request (Iteration {iteration})
 
 Evaluate the following generated web application code.
 
 ## Generated HTML
 ```html
-{html[:8000]}
-{"... [truncated]" if len(html) > 8000 else ""}
+{_clip(html, 8000)}
 ```
 
 ## Generated CSS
 ```css
-{css[:3000]}
-{"... [truncated]" if len(css) > 3000 else ""}
+{_clip(css, 3000)}
 ```
 
 ## Generated JavaScript
 ```javascript
-{js[:5000]}
-{"... [truncated]" if len(js) > 5000 else ""}
+{_clip(js, 5000)}
 ```
 
 ## Excel Formulas to Verify
-{chr(10).join([f"- {f['cell']}: {f['formula']}" for f in formulas[:15]])}
-{"... and more" if len(formulas) > 15 else ""}
+{formula_lines}
+{more}
 
 ## Evaluation Instructions
 
@@ -417,7 +440,7 @@ Evaluate the following generated web application code.
 3. Assess overall code quality
 4. Provide specific, actionable feedback
 
-{"Note: This is iteration " + str(iteration) + ". Be lenient if code is functional but not perfect." if iteration >= 3 else ""}
+{lenient}
 
 Return a structured TestEvaluation with your findings.
 """
@@ -1,10 +1,14 @@
 """FastAPI routes for Excel to WebApp conversion."""
 
+import asyncio
 import os
+import shutil
 import tempfile
+import threading
 import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.responses import HTMLResponse, JSONResponse
@@ -16,13 +20,91 @@ from src.orchestrator import (
     convert_excel_to_webapp,
 )
 from src.models import ConversionResult, GeneratedWebApp
+from src.tools.excel_analyzer import workbook_cache_disabled
 
 
 router = APIRouter(prefix="/api/v1", tags=["conversion"])
 
 
-# In-memory storage for conversion jobs (would use Redis/DB in production)
-conversion_jobs: dict[str, dict] = {}
+# Jobs kept in memory; past this, least recently used finished jobs are dropped
+MAX_JOBS = 256
+_FINISHED_STATUSES = frozenset({"complete", "failed"})
+
+
+class JobStore:
+    """
+    Bounded in-memory job table (would use Redis/DB in production).
+
+    The table is accessed both from request handlers and from the
+    background conversion thread, so access goes through a lock: get()
+    returns a snapshot copy and update() applies field changes atomically,
+    so a reader never sees a half-applied update. Lookups and updates
+    mark a job as recently used; once more than max_jobs are stored, the
+    least recently used finished jobs are evicted. Jobs still in progress
+    are never evicted.
+    """
+
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._jobs.move_to_end(job_id)
+            return dict(job)
+
+    def update(self, job_id: str, **fields) -> bool:
+        """Set fields on a job under the lock; False if the job no longer exists."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            job.update(fields)
+            self._jobs.move_to_end(job_id)
+            return True
+
+    def __setitem__(self, job_id: str, job: dict) -> None:
+        with self._lock:
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            self._evict(keep=job_id)
+
+    def pop(self, job_id: str, default: Optional[dict] = None) -> Optional[dict]:
+        with self._lock:
+            return self._jobs.pop(job_id, default)
+
+    def _evict(self, keep: str) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        evictable = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job_id != keep and job["status"] in _FINISHED_STATUSES
+        ][:excess]
+        for job_id in evictable:
+            del self._jobs[job_id]
+
+
+conversion_jobs = JobStore()
+
+
+# Largest accepted workbook upload
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# Uploads are copied to disk in chunks of this size
+_UPLOAD_CHUNK_SIZE = 64 * 1024
 
 
 class ConversionRequest(BaseModel):
@@ -46,6 +128,20 @@ class DownloadResponse(BaseModel):
     html: str
 
 
+def _save_upload(upload: BinaryIO, dest: Path, max_bytes: int = MAX_UPLOAD_BYTES) -> None:
+    """Copy an uploaded file to dest in fixed-size chunks, rejecting oversize uploads."""
+    written = 0
+    with open(dest, "wb") as f:
+        while chunk := upload.read(_UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB",
+                )
+            f.write(chunk)
+
+
 @router.post("/convert", response_model=ConversionStatus)
 async def start_conversion(
     file: UploadFile = File(...),
@@ -75,9 +171,11 @@ async def start_conversion(
     temp_dir = tempfile.mkdtemp()
     temp_path = Path(temp_dir) / file.filename
 
-    content = await file.read()
-    with open(temp_path, "wb") as f:
-        f.write(content)
+    try:
+        await asyncio.to_thread(_save_upload, file.file, temp_path, MAX_UPLOAD_BYTES)
+    except HTTPException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
 
     # Initialize job status
     conversion_jobs[job_id] = {
@@ -113,30 +211,36 @@ async def run_conversion_async(job_id: str):
     file_path = job["file_path"]
 
     def progress_callback(progress: ConversionProgress):
-        job["status"] = progress.stage
-        job["progress"] = progress.progress
-        job["message"] = progress.message
+        conversion_jobs.update(
+            job_id,
+            status=progress.stage,
+            progress=progress.progress,
+            message=progress.message,
+        )
 
     try:
-        result = await convert_excel_to_webapp(file_path, progress_callback)
+        # Uploads are deleted afterwards, so don't pin their workbook handles
+        with workbook_cache_disabled():
+            result = await convert_excel_to_webapp(file_path, progress_callback)
 
         if result.success:
-            job["status"] = "complete"
-            job["progress"] = 1.0
-            job["message"] = "변환 완료!"
-            job["result"] = {
-                "app_name": result.app.app_name,
-                "html": result.app.html,
-                "iterations": result.iterations_used,
-                "pass_rate": result.final_pass_rate,
-            }
+            conversion_jobs.update(
+                job_id,
+                status="complete",
+                progress=1.0,
+                message="변환 완료!",
+                result={
+                    "app_name": result.app.app_name,
+                    "html": result.app.html,
+                    "iterations": result.iterations_used,
+                    "pass_rate": result.final_pass_rate,
+                },
+            )
         else:
-            job["status"] = "failed"
-            job["message"] = result.message
+            conversion_jobs.update(job_id, status="failed", message=result.message)
 
     except Exception as e:
-        job["status"] = "failed"
-        job["message"] = f"변환 오류: {str(e)}"
+        conversion_jobs.update(job_id, status="failed", message=f"변환 오류: {str(e)}")
 
     finally:
         # Clean up temp file
@@ -149,7 +253,6 @@ async def run_conversion_async(job_id: str):
 
 def run_conversion(job_id: str):
     """Run conversion in background (sync wrapper)."""
-    import asyncio
     asyncio.run(run_conversion_async(job_id))
 
 
@@ -237,10 +340,9 @@ async def delete_job(job_id: str):
     """
     Delete a conversion job and its results.
     """
-    if job_id not in conversion_jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
     job = conversion_jobs.pop(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
 
     # Clean up temp file if still exists
     file_path = job.get("file_path")
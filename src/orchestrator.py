@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Optional, Callable
 from dataclasses import dataclass
 
-from agents import Runner, trace
+from agents import RunConfig, Runner, trace
 
 from src.models import (
     ExcelAnalysis,
@@ -48,6 +48,7 @@ from src.agents import (
     convert_to_static_test_suite,
     GeneratedTestSuite,
 )
+from src.agents._cache import CachingModelProvider, LLMCache, output_cache_key
 from src.tracing import (
     ConversationCaptureHooks,
     ConversationTrace,
@@ -88,6 +89,7 @@ class ExcelToWebAppOrchestrator:
         progress_callback: Optional[ProgressCallback] = None,
         verbose: bool = False,
         run_static_tests: bool = True,
+        llm_cache: Optional[LLMCache] = None,
     ):
         """
         Initialize the orchestrator.
@@ -98,12 +100,17 @@ class ExcelToWebAppOrchestrator:
             progress_callback: Optional callback for progress updates
             verbose: Whether to print detailed monitoring output
             run_static_tests: Whether to run deterministic static tests
+            llm_cache: Optional response cache; identical model requests are replayed
         """
         self.max_iterations = max_iterations
         self.min_pass_rate = min_pass_rate
         self.progress_callback = progress_callback
         self.verbose = verbose
         self.run_static_tests_flag = run_static_tests
+        self.llm_cache = llm_cache
+        self.run_config = (
+            RunConfig(model_provider=CachingModelProvider(llm_cache)) if llm_cache else None
+        )
 
         # Create all agents (all use OpenAI Agents SDK)
         self.analyzer = create_analyzer_agent()
@@ -127,6 +134,27 @@ class ExcelToWebAppOrchestrator:
                 progress=progress,
             ))
 
+    async def _cached_output(self, key: str, model_cls):
+        """Return a cached agent output validated as model_cls, or None."""
+        if self.llm_cache is None:
+            return None
+        blob = await self.llm_cache.get(key)
+        if blob is None:
+            return None
+        try:
+            return model_cls.model_validate_json(blob)
+        except ValueError:
+            return None  # schema changed since the entry was written
+
+    async def _store_output(self, key: str, output) -> None:
+        """Persist an agent output (as JSON) for _cached_output.
+
+        Stored as pydantic's JSON string and replayed with model_validate_json,
+        so neither direction goes through the stdlib json module.
+        """
+        if self.llm_cache is not None:
+            await self.llm_cache.set(key, output.model_dump_json())
+
     async def convert(self, excel_path: str) -> ConversionResult:
         """
         Convert an Excel file to a web application.
@@ -181,9 +209,18 @@ class ExcelToWebAppOrchestrator:
                         conversation_trace=hooks.get_trace().to_dict(),
                     )
 
-                # Stage 2: Create Spec (TDD - replaces Plan)
+                # Stage 2: Create Spec (TDD - replaces Plan). The Spec agent is
+                # LLM-bound, so the local workbook test extraction for Stage 3
+                # runs in a worker thread alongside it.
                 self._report_progress("spec", "TDD 스펙 생성 중...", 0.2)
-                spec = await self._create_spec(analysis, hooks)
+                if self.run_static_tests_flag:
+                    spec, basic_suite = await asyncio.gather(
+                        self._create_spec(analysis, hooks),
+                        self._extract_basic_tests(excel_path, analysis),
+                    )
+                else:
+                    spec = await self._create_spec(analysis, hooks)
+                    basic_suite = None
 
                 if spec is None:
                     # Fallback to legacy Plan if Spec fails
@@ -208,12 +245,9 @@ class ExcelToWebAppOrchestrator:
                     print(f"{Colors.OUTPUT}✅ Spec/Plan created: {plan.app_name}{Colors.RESET}")
 
                 # Stage 3: Test-First - Generate failing tests from Spec
-                if self.run_static_tests_flag:
+                if basic_suite is not None:
                     self._report_progress("test_first", "테스트 케이스 생성 중 (TDD)...", 0.3)
                     try:
-                        # Extract basic test cases from Excel
-                        basic_suite = extract_test_cases(excel_path, analysis)
-
                         if self.verbose:
                             print(f"\n{Colors.OUTPUT}📋 Basic extraction: {len(basic_suite.formula_tests)} test cases{Colors.RESET}")
 
@@ -238,6 +272,9 @@ class ExcelToWebAppOrchestrator:
                         if self.verbose:
                             print(f"{Colors.ERROR}⚠️ Test-First generation failed: {e}{Colors.RESET}")
                         self.static_test_suite = None
+                elif self.run_static_tests_flag:
+                    # Extraction failed (already reported by _extract_basic_tests)
+                    self.static_test_suite = None
 
                 # Stage 4: Generate code to pass tests (with iterations)
                 self._report_progress("generate", "코드 생성 중...", 0.5)
@@ -283,6 +320,19 @@ class ExcelToWebAppOrchestrator:
                     conversation_trace=hooks.get_trace().to_dict(),
                 )
 
+    async def _extract_basic_tests(
+        self,
+        excel_path: str,
+        analysis: ExcelAnalysis,
+    ) -> Optional[StaticTestSuite]:
+        """Extract formula test cases from the workbook off the event loop."""
+        try:
+            return await asyncio.to_thread(extract_test_cases, excel_path, analysis)
+        except Exception as e:
+            if self.verbose:
+                print(f"{Colors.ERROR}⚠️ Test-First generation failed: {e}{Colors.RESET}")
+            return None
+
     async def _generate_tests_with_agent(
         self,
         analysis: ExcelAnalysis,
@@ -310,6 +360,7 @@ class ExcelToWebAppOrchestrator:
                 self.test_generator,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
             if result.final_output:
@@ -352,21 +403,34 @@ class ExcelToWebAppOrchestrator:
             WebAppSpec with testable requirements, or None if failed
         """
         try:
-            prompt = create_spec_prompt(analysis.model_dump())
+            analysis_dict = analysis.model_dump()
+            # pydantic-core serializes in Rust; far cheaper than json.dumps here
+            cache_key = output_cache_key(
+                "spec", self.spec_agent.instructions, analysis.model_dump_json()
+            )
+            cached = await self._cached_output(cache_key, WebAppSpec)
+            if cached is not None:
+                return cached
+
+            prompt = create_spec_prompt(analysis_dict)
 
             result = await Runner.run(
                 self.spec_agent,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
+            spec = None
             if result.final_output:
                 if isinstance(result.final_output, WebAppSpec):
-                    return result.final_output
+                    spec = result.final_output
                 elif isinstance(result.final_output, dict):
-                    return WebAppSpec(**result.final_output)
+                    spec = WebAppSpec(**result.final_output)
 
-            return None
+            if spec is not None:
+                await self._store_output(cache_key, spec)
+            return spec
 
         except Exception as e:
             if self.verbose:
@@ -500,6 +564,7 @@ class ExcelToWebAppOrchestrator:
                 self.test_generator,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
             if result.final_output:
@@ -620,6 +685,7 @@ class ExcelToWebAppOrchestrator:
                 self.analyzer,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
             # The agent returns the analysis via tool call result
@@ -648,21 +714,32 @@ class ExcelToWebAppOrchestrator:
         try:
             # Convert analysis to dict for prompt
             analysis_dict = analysis.model_dump()
+            cache_key = output_cache_key(
+                "planner", self.planner.instructions, analysis.model_dump_json()
+            )
+            cached = await self._cached_output(cache_key, WebAppPlan)
+            if cached is not None:
+                return cached
+
             prompt = create_plan_prompt(analysis_dict)
 
             result = await Runner.run(
                 self.planner,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
+            plan = None
             if result.final_output:
                 if isinstance(result.final_output, dict):
-                    return WebAppPlan(**result.final_output)
+                    plan = WebAppPlan(**result.final_output)
                 elif isinstance(result.final_output, WebAppPlan):
-                    return result.final_output
+                    plan = result.final_output
 
-            return None
+            if plan is not None:
+                await self._store_output(cache_key, plan)
+            return plan
 
         except Exception as e:
             print(f"Planning error: {e}")
@@ -874,6 +951,7 @@ class ExcelToWebAppOrchestrator:
                 self.tester,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
             if result.final_output:
@@ -982,6 +1060,7 @@ Focus on:
                 self.generator,
                 prompt,
                 hooks=hooks,
+                run_config=self.run_config,
             )
 
             if result.final_output:
@@ -1153,6 +1232,7 @@ async def convert_excel_to_webapp(
     verbose: bool = False,
     max_iterations: int = 3,
     run_static_tests: bool = True,
+    llm_cache: Optional[LLMCache] = None,
 ) -> ConversionResult:
     """
     Convenience function to convert an Excel file to a web app.
@@ -1169,6 +1249,7 @@ async def convert_excel_to_webapp(
         verbose: Whether to print detailed monitoring output
         max_iterations: Maximum iterations for improvement (default: 3)
         run_static_tests: Whether to run deterministic formula tests
+        llm_cache: Optional LLM response cache shared across agent runs
 
     Returns:
         ConversionResult with the generated web app
@@ -1178,6 +1259,7 @@ async def convert_excel_to_webapp(
         verbose=verbose,
         max_iterations=max_iterations,
         run_static_tests=run_static_tests,
+        llm_cache=llm_cache,
     )
     return await orchestrator.convert(excel_path)
 
@@ -3,6 +3,7 @@
 from .excel_analyzer import (
     analyze_excel_file,
     get_cell_data,
+    workbook_cache_disabled,
 )
 from .formula_converter import (
     is_simple_formula,
@@ -40,6 +41,7 @@ __all__ = [
     # Excel analyzer
     "analyze_excel_file",
     "get_cell_data",
+    "workbook_cache_disabled",
     # Formula converter
     "is_simple_formula",
     "convert_simple_formula",
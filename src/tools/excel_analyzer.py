@@ -1,13 +1,31 @@
 """Excel file analysis tools using openpyxl, formulas, and oletools."""
 
+import multiprocessing
+import os
 import re
+import threading
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+from xml.etree.ElementTree import iterparse
 
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.cell import Cell
+from openpyxl.cell.read_only import EMPTY_CELL
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from openpyxl.worksheet.header_footer import HeaderFooter
+from openpyxl.worksheet.page import PageMargins, PrintPageSetup
+from openpyxl.worksheet.properties import WorksheetProperties
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.formula import Tokenizer
+from openpyxl.xml.constants import SHEET_MAIN_NS
 
 from src.models import (
     CellInfo,
@@ -28,6 +46,82 @@ PAPER_SIZES = {
     11: "A5",
 }
 
+# Multi-sheet workbooks with at least this much (uncompressed) worksheet XML
+# are analyzed one sheet per process; below it, process startup and the
+# per-worker workbook load cost more than parsing the sheets serially
+PARALLEL_MIN_SHEET_BYTES = 16 * 1024 * 1024
+# Shared sheet-analysis pool, started on first use (see _sheet_pool)
+_SHEET_POOL: Optional[ProcessPoolExecutor] = None
+_SHEET_POOL_LOCK = threading.Lock()
+
+# Open read-only workbooks pinned across tool calls (see _get_workbook)
+WORKBOOK_CACHE_SIZE = 4
+_WB_CACHE: OrderedDict[tuple[str, int, int, int], Workbook] = OrderedDict()
+_WB_CACHE_LOCK = threading.Lock()
+# Cleared by workbook_cache_disabled() for callers whose files are short-lived
+_WB_CACHE_ENABLED: ContextVar[bool] = ContextVar("workbook_cache_enabled", default=True)
+
+
+@contextmanager
+def workbook_cache_disabled() -> Iterator[None]:
+    """
+    Open and close workbooks per call instead of pinning them.
+
+    Use this around work on temporary files (e.g. API uploads that are deleted
+    after conversion): a pinned handle would keep a descriptor to the deleted
+    file open until it is evicted.
+    """
+    token = _WB_CACHE_ENABLED.set(False)
+    try:
+        yield
+    finally:
+        _WB_CACHE_ENABLED.reset(token)
+
+
+def _get_workbook(file_path: str) -> Workbook:
+    """
+    Return a pinned read-only workbook for file_path, loading it on first use.
+
+    Handles are keyed on (resolved path, inode, mtime, size) so an edited or
+    replaced file is reloaded; the least recently used handle is closed once
+    more than WORKBOOK_CACHE_SIZE are open. Callers must not close the
+    returned workbook.
+    """
+    stat = os.stat(file_path)
+    key = (str(Path(file_path).resolve()), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _WB_CACHE_LOCK:
+        wb = _WB_CACHE.get(key)
+        if wb is not None:
+            _WB_CACHE.move_to_end(key)
+            return wb
+
+    # data_only=False to get formulas
+    wb = load_workbook(file_path, read_only=True, data_only=False, keep_links=False)
+    with _WB_CACHE_LOCK:
+        existing = _WB_CACHE.get(key)
+        if existing is not None:  # another thread loaded it first
+            wb.close()
+            return existing
+        _WB_CACHE[key] = wb
+        while len(_WB_CACHE) > WORKBOOK_CACHE_SIZE:
+            _, evicted = _WB_CACHE.popitem(last=False)
+            evicted.close()
+    return wb
+
+
+@contextmanager
+def _open_workbook(file_path: str) -> Iterator[Workbook]:
+    """Read-only workbook for file_path: pinned, or closed on exit if caching is disabled."""
+    if _WB_CACHE_ENABLED.get():
+        yield _get_workbook(file_path)
+        return
+
+    wb = load_workbook(file_path, read_only=True, data_only=False, keep_links=False)
+    try:
+        yield wb
+    finally:
+        wb.close()
+
 
 def analyze_excel_file(file_path: str) -> ExcelAnalysis:
     """
@@ -42,19 +136,24 @@ def analyze_excel_file(file_path: str) -> ExcelAnalysis:
     path = Path(file_path)
     file_type = path.suffix.lower().lstrip(".")
 
-    # Load workbook (data_only=False to get formulas)
-    wb = load_workbook(file_path, data_only=False)
+    # Read-only workbook (streams rows, skips style DOM), shared with get_cell_data
+    with _open_workbook(file_path) as wb:
+        # Analyze each sheet (fanned out across processes for larger workbooks)
+        sheet_names = wb.sheetnames
+        sheets = None
+        if len(sheet_names) > 1 and _worksheet_xml_size(file_path) >= PARALLEL_MIN_SHEET_BYTES:
+            sheets = _analyze_sheets_parallel(file_path, sheet_names)
+        if sheets is None:
+            sheets = [_analyze_sheet(wb[sheet_name]) for sheet_name in sheet_names]
+
+        # Get print settings from first sheet
+        print_settings = _extract_print_settings(wb.active) if wb.active else None
 
-    # Analyze each sheet
-    sheets = []
     all_formulas = []
     all_input_cells = []
     all_output_cells = []
 
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        sheet_info = _analyze_sheet(ws)
-        sheets.append(sheet_info)
+    for sheet_info in sheets:
         all_formulas.extend(sheet_info.formulas)
         all_input_cells.extend(sheet_info.input_cells)
         all_output_cells.extend(sheet_info.output_cells)
@@ -65,9 +164,6 @@ def analyze_excel_file(file_path: str) -> ExcelAnalysis:
     if has_vba:
         vba_modules = _extract_vba(file_path)
 
-    # Get print settings from first sheet
-    print_settings = _extract_print_settings(wb.active) if wb.active else None
-
     # Calculate complexity score
     complexity = _calculate_complexity(
         len(all_formulas),
@@ -75,8 +171,6 @@ def analyze_excel_file(file_path: str) -> ExcelAnalysis:
         len(sheets)
     )
 
-    wb.close()
-
     return ExcelAnalysis(
         filename=path.name,
         file_type=file_type,
@@ -91,21 +185,101 @@ def analyze_excel_file(file_path: str) -> ExcelAnalysis:
     )
 
 
+def _worksheet_xml_size(file_path: str) -> int:
+    """Total uncompressed size of the worksheet parts in an .xlsx/.xlsm package."""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return sum(
+                info.file_size
+                for info in archive.infolist()
+                if info.filename.startswith("xl/worksheets/") and info.filename.endswith(".xml")
+            )
+    except (OSError, zipfile.BadZipFile):
+        return 0
+
+
+def _sheet_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool shared by every analyze_excel_file call, or None on one CPU.
+
+    Workers are started with forkserver (spawn where unavailable) rather than
+    fork, since the API process already runs an event loop and worker threads.
+    """
+    global _SHEET_POOL
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    with _SHEET_POOL_LOCK:
+        if _SHEET_POOL is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _SHEET_POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _SHEET_POOL
+
+
+def _discard_sheet_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call starts a fresh one."""
+    global _SHEET_POOL
+    with _SHEET_POOL_LOCK:
+        if _SHEET_POOL is pool:
+            _SHEET_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_sheets_parallel(file_path: str, sheet_names: list[str]) -> Optional[list[SheetInfo]]:
+    """Analyze sheets in worker processes; None if the pool is unavailable."""
+    pool = _sheet_pool()
+    if pool is None:
+        return None
+    try:
+        return list(pool.map(_analyze_sheet_at, repeat(file_path), sheet_names))
+    except (BrokenProcessPool, OSError):
+        _discard_sheet_pool(pool)
+        return None
+
+
+def _analyze_sheet_at(file_path: str, sheet_name: str) -> SheetInfo:
+    """Open the workbook read-only and analyze one sheet (process pool worker)."""
+    wb = load_workbook(file_path, read_only=True, data_only=False, keep_links=False)
+    try:
+        return _analyze_sheet(wb[sheet_name])
+    finally:
+        wb.close()
+
+
 def _analyze_sheet(ws: Worksheet) -> SheetInfo:
     """Analyze a single worksheet."""
-    # Get dimensions
-    min_row = ws.min_row or 1
-    max_row = ws.max_row or 1
-    min_col = ws.min_column or 1
-    max_col = ws.max_column or 1
+    # A read-only sheet's stored <dimension> may be missing or stale, so the
+    # used range is measured from the cells actually streamed below
+    if isinstance(ws, ReadOnlyWorksheet):
+        ws.reset_dimensions()
+        rows = ws.iter_rows()
+    else:
+        rows = ws.iter_rows(
+            min_row=ws.min_row, max_row=ws.max_row,
+            min_col=ws.min_column, max_col=ws.max_column,
+        )
 
-    used_range = f"{ws.cell(min_row, min_col).coordinate}:{ws.cell(max_row, max_col).coordinate}"
+    min_row = min_col = None
+    max_row = max_col = 0
 
     # Find all formulas
     formulas = []
     formula_cells = set()
 
-    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+    for row in rows:
+        if not row:
+            continue
+        # Rows end at their last stored cell; gaps are EMPTY_CELL placeholders
+        first = next(cell for cell in row if cell is not EMPTY_CELL)
+        if min_row is None:
+            min_row = first.row
+        min_col = first.column if min_col is None else min(min_col, first.column)
+        max_row = row[-1].row
+        max_col = max(max_col, row[-1].column)
+
         for cell in row:
             if cell.data_type == "f" and cell.value:
                 formula_str = str(cell.value)
@@ -120,6 +294,14 @@ def _analyze_sheet(ws: Worksheet) -> SheetInfo:
                 ))
                 formula_cells.add(cell.coordinate)
 
+    # Get dimensions
+    min_row = min_row or 1
+    max_row = max_row or 1
+    min_col = min_col or 1
+    max_col = max_col or 1
+
+    used_range = f"{_num_to_col(min_col)}{min_row}:{_num_to_col(max_col)}{max_row}"
+
     # Detect input cells (referenced by formulas but not formulas themselves)
     referenced_cells = set()
     for formula in formulas:
@@ -129,7 +311,7 @@ def _analyze_sheet(ws: Worksheet) -> SheetInfo:
     output_cells = [f.cell for f in formulas]
 
     # Check print area
-    print_area = ws.print_area
+    print_area = _get_print_area(ws)
     has_print_area = bool(print_area)
 
     return SheetInfo(
@@ -145,6 +327,19 @@ def _analyze_sheet(ws: Worksheet) -> SheetInfo:
     )
 
 
+def _get_print_area(ws: Worksheet) -> Optional[str]:
+    """Print area of a worksheet (e.g. "'Sheet1'!$A$1:$D$20"), or None if not set."""
+    if isinstance(ws, ReadOnlyWorksheet):
+        # Read-only sheets have no print_area property, but the workbook
+        # reader still binds the _xlnm.Print_Area defined name to them
+        area = getattr(ws, "_print_area", None)
+        if area is None:
+            return None
+        area.title = ws.title
+        return str(area) or None
+    return ws.print_area or None
+
+
 def _extract_cell_references(formula: str) -> list[str]:
     """Extract cell references from a formula using openpyxl tokenizer."""
     try:
@@ -165,11 +360,11 @@ def _extract_cell_references(formula: str) -> list[str]:
                     refs.extend(_expand_range(value))
                 else:
                     refs.append(value)
-        return list(set(refs))
+        return list(dict.fromkeys(refs))  # dedup, keeping formula order
     except Exception:
         # Fallback: simple regex for cell references
         pattern = r"[A-Z]+[0-9]+"
-        return list(set(re.findall(pattern, formula.upper())))
+        return list(dict.fromkeys(re.findall(pattern, formula.upper())))
 
 
 def _expand_range(range_str: str) -> list[str]:
@@ -285,9 +480,54 @@ def _extract_vba_procedures(code: str) -> list[str]:
     return procedures
 
 
+# Page layout elements of a worksheet part -> (attribute, openpyxl class)
+_PAGE_LAYOUT_TAGS = {
+    f"{{{SHEET_MAIN_NS}}}sheetPr": ("sheet_properties", WorksheetProperties),
+    f"{{{SHEET_MAIN_NS}}}pageMargins": ("page_margins", PageMargins),
+    f"{{{SHEET_MAIN_NS}}}pageSetup": ("page_setup", PrintPageSetup),
+    f"{{{SHEET_MAIN_NS}}}headerFooter": ("HeaderFooter", HeaderFooter),
+}
+_ROW_TAG = f"{{{SHEET_MAIN_NS}}}row"
+
+
+def _read_page_layout(ws: ReadOnlyWorksheet) -> SimpleNamespace:
+    """
+    Page setup, margins and header/footer of a read-only worksheet.
+
+    ReadOnlyWorksheet only streams cells, so these elements are parsed from
+    the worksheet XML directly. Rows are cleared as they are passed, keeping
+    memory flat on large sheets. The result exposes the same attributes
+    _extract_print_settings reads from a regular Worksheet.
+    """
+    layout = SimpleNamespace(
+        sheet_properties=WorksheetProperties(),
+        page_margins=PageMargins(),
+        page_setup=PrintPageSetup(),
+        HeaderFooter=HeaderFooter(),
+    )
+    with ws._get_source() as src:
+        for _, element in iterparse(src):
+            if element.tag == _ROW_TAG:
+                element.clear()
+                continue
+            spec = _PAGE_LAYOUT_TAGS.get(element.tag)
+            if spec is not None:
+                attr, cls = spec
+                setattr(layout, attr, cls.from_tree(element))
+
+    # fitToPage lives in sheetPr/pageSetUpPr and is looked up through the parent
+    layout.page_setup._parent = layout
+    layout.oddHeader = layout.HeaderFooter.oddHeader
+    layout.oddFooter = layout.HeaderFooter.oddFooter
+    return layout
+
+
 def _extract_print_settings(ws: Worksheet) -> PrintSettings:
     """Extract print settings from a worksheet."""
     try:
+        if isinstance(ws, ReadOnlyWorksheet):
+            ws = _read_page_layout(ws)
+
         page_setup = ws.page_setup
         margins = ws.page_margins
 
@@ -430,23 +670,23 @@ def get_cell_data(file_path: str, sheet_name: str = None) -> dict[str, CellInfo]
     Returns:
         Dictionary mapping cell addresses to CellInfo
     """
-    wb = load_workbook(file_path, data_only=False)
-    ws = wb[sheet_name] if sheet_name else wb.active
-
     cells = {}
-    for row in ws.iter_rows():
-        for cell in row:
-            if cell.value is not None or cell.data_type == "f":
-                data_type = _get_cell_data_type(cell)
-                cells[cell.coordinate] = CellInfo(
-                    address=cell.coordinate,
-                    value=cell.value,
-                    formula=str(cell.value) if cell.data_type == "f" else None,
-                    data_type=data_type,
-                    format=cell.number_format,
-                )
-
-    wb.close()
+    with _open_workbook(file_path) as wb:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        if isinstance(ws, ReadOnlyWorksheet):
+            ws.reset_dimensions()  # read every stored row, not just the <dimension> range
+        for row in ws.iter_rows():
+            for cell in row:
+                if cell.value is not None or cell.data_type == "f":
+                    data_type = _get_cell_data_type(cell)
+                    cells[cell.coordinate] = CellInfo(
+                        address=cell.coordinate,
+                        value=cell.value,
+                        formula=str(cell.value) if cell.data_type == "f" else None,
+                        data_type=data_type,
+                        format=cell.number_format,
+                    )
+
     return cells
 
 
@@ -8,6 +8,7 @@ This allows us to automatically generate test cases by:
 3. Creating input → expected_output test cases
 """
 
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -177,8 +178,6 @@ def _extract_sheet_tests(
 
 def _extract_input_refs(formula: str) -> list[str]:
     """Extract cell references from a formula."""
-    import re
-
     # Remove the leading '=' if present
     if formula.startswith("="):
         formula = formula[1:]
@@ -203,8 +202,6 @@ def _extract_input_refs(formula: str) -> list[str]:
 
 def _expand_range(start: str, end: str) -> list[str]:
     """Expand a cell range to individual cells."""
-    import re
-
     start_match = re.match(r'([A-Z]+)(\d+)', start)
     end_match = re.match(r'([A-Z]+)(\d+)', end)
 
@@ -0,0 +1,147 @@
+"""Unit tests for the LLM response cache (src/agents/_cache.py).
+
+Covers cache keys, TTL expiry, the JSON on-disk format and replaying
+ModelResponses through CachingModel.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from agents import ModelSettings
+from agents.models.interface import ModelTracing
+
+from src.agents import _cache
+from src.agents._cache import CachingModel, LLMCache, cache_key
+
+from tests.fake_model import FakeModel
+from tests.helpers import get_text_message
+
+
+def _request(text: str = "hello") -> dict:
+    """Keyword arguments of a Model.get_response call."""
+    return {
+        "system_instructions": "You are a spreadsheet analyst.",
+        "input": text,
+        "model_settings": ModelSettings(temperature=0.0),
+        "tools": [],
+        "output_schema": None,
+        "handoffs": [],
+        "tracing": ModelTracing.DISABLED,
+        "previous_response_id": None,
+        "conversation_id": None,
+        "prompt": None,
+    }
+
+
+class TestCacheKey:
+    """Keys depend on the request content only."""
+
+    def test_equal_requests_share_a_key(self):
+        """Separately built but equal requests produce the same key."""
+        assert cache_key("gpt-5-mini", **_request()) == cache_key("gpt-5-mini", **_request())
+
+    def test_model_and_input_change_the_key(self):
+        """Another model name or input yields another key."""
+        base = cache_key("gpt-5-mini", **_request())
+        assert cache_key("gpt-5.2", **_request()) != base
+        assert cache_key("gpt-5-mini", **_request("bye")) != base
+
+    def test_key_is_stable_across_processes(self):
+        """The key does not depend on hash randomization or object identity."""
+        code = (
+            "from tests.agents.test_cache import _request;"
+            "from src.agents._cache import cache_key;"
+            "print(cache_key('gpt-5-mini', **_request()))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        assert out == cache_key("gpt-5-mini", **_request())
+
+
+class TestLLMCache:
+    """Storage, expiry and persistence of cache entries."""
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, tmp_path, monkeypatch):
+        """An entry older than the TTL is reported as a miss."""
+        now = [1000.0]
+        monkeypatch.setattr(_cache.time, "time", lambda: now[0])
+        cache = LLMCache(tmp_path, ttl=60)
+
+        await cache.set("k", {"answer": 42})
+        now[0] += 59
+        assert await cache.get("k") == {"answer": 42}
+        now[0] += 2
+        assert await cache.get("k") is None
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_round_trip(self, tmp_path):
+        """A new cache instance reads entries written by another one."""
+        await LLMCache(tmp_path).set("k", {"text": "합계", "rows": [1, 2]})
+
+        assert await LLMCache(tmp_path).get("k") == {"text": "합계", "rows": [1, 2]}
+
+    @pytest.mark.asyncio
+    async def test_entries_are_plain_json(self, tmp_path):
+        """Entries are JSON files; nothing is pickled."""
+        await LLMCache(tmp_path).set("k", "value")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["k.json"]
+        entry = json.loads((tmp_path / "k.json").read_text(encoding="utf-8"))
+        assert entry["value"] == "value"
+        assert isinstance(entry["stored_at"], float)
+
+    @pytest.mark.asyncio
+    async def test_unreadable_entry_is_a_miss(self, tmp_path):
+        """A corrupt file is ignored rather than raising."""
+        (tmp_path / "k.json").write_text("{not json", encoding="utf-8")
+
+        assert await LLMCache(tmp_path).get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_non_json_value_is_not_persisted(self, tmp_path):
+        """Values without a JSON form stay in memory only."""
+        cache = LLMCache(tmp_path)
+        await cache.set("k", object())
+
+        assert not (tmp_path / "k.json").exists()
+        assert await LLMCache(tmp_path).get("k") is None
+
+
+class TestCachingModel:
+    """ModelResponses are replayed from disk."""
+
+    @pytest.mark.asyncio
+    async def test_response_replayed_from_disk(self, tmp_path):
+        """A second run (fresh process state) gets the stored response back."""
+        model = FakeModel(initial_output=[get_text_message("첫 응답")])
+        first = await CachingModel(model, "gpt-5-mini", LLMCache(tmp_path)).get_response(
+            **_request()
+        )
+        replayed = await CachingModel(model, "gpt-5-mini", LLMCache(tmp_path)).get_response(
+            **_request()
+        )
+
+        # The fake model has no second output, so a real call would return []
+        assert replayed == first
+        assert replayed.output[0].content[0].text == "첫 응답"
+
+    @pytest.mark.asyncio
+    async def test_invalid_stored_response_is_refetched(self, tmp_path):
+        """An entry that no longer validates as a ModelResponse is replaced."""
+        cache = LLMCache(tmp_path)
+        await cache.set(cache_key("gpt-5-mini", **_request()), {"output": "bogus"})
+        model = FakeModel(initial_output=[get_text_message("fresh")])
+
+        response = await CachingModel(model, "gpt-5-mini", cache).get_response(**_request())
+
+        assert response.output[0].content[0].text == "fresh"
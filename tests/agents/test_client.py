@@ -0,0 +1,51 @@
+"""Unit tests for the shared AsyncOpenAI client (src/agents/_client.py)."""
+
+from __future__ import annotations
+
+import pytest
+
+from agents.models import _openai_shared
+
+from src.agents import _client
+from src.agents._client import shared_openai_client
+
+
+@pytest.fixture(autouse=True)
+def isolated_default(monkeypatch):
+    """Keep the SDK default (and the tracing key) untouched outside each test."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(_openai_shared, "_default_openai_client", None)
+    monkeypatch.setattr(
+        _client, "set_default_openai_client", _openai_shared.set_default_openai_client
+    )
+
+
+class TestSharedOpenAIClient:
+    """The shared client is the SDK default only inside the block."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_default_inside_the_block(self):
+        """Agent runs inside the block use the shared client."""
+        async with shared_openai_client() as client:
+            assert _openai_shared.get_default_openai_client() is client
+
+    @pytest.mark.asyncio
+    async def test_previous_default_is_restored(self):
+        """After the block the closed client is no longer the default."""
+        sentinel = object()
+        _openai_shared.set_default_openai_client(sentinel)
+
+        async with shared_openai_client() as client:
+            pass
+
+        assert client.is_closed()
+        assert _openai_shared.get_default_openai_client() is sentinel
+
+    @pytest.mark.asyncio
+    async def test_previous_default_is_restored_on_error(self):
+        """A failing conversion still restores the previous default."""
+        with pytest.raises(RuntimeError):
+            async with shared_openai_client():
+                raise RuntimeError("boom")
+
+        assert _openai_shared.get_default_openai_client() is None
@@ -122,6 +122,74 @@ class TestCreateSpecPrompt:
         prompt = create_spec_prompt(analysis_dict)
         assert "VBA" in prompt or "Module1" in prompt
 
+    def test_prompt_orders_calculations_by_dependency(self):
+        """Test that formulas are listed after the formulas they depend on."""
+        analysis_dict = {
+            "filename": "chain.xlsx",
+            "sheets": [{
+                "name": "Sheet1",
+                "row_count": 3,
+                "col_count": 2,
+                "used_range": "A1:B3",
+                "input_cells": ["A1"],
+                "output_cells": ["B3"],
+                "formulas": [
+                    {"cell": "B3", "formula": "=B2+1", "dependencies": ["B2"]},
+                    {"cell": "B2", "formula": "=A1*2", "dependencies": ["A1"]},
+                ],
+            }],
+            "has_vba": False,
+        }
+        prompt = create_spec_prompt(analysis_dict)
+        assert "Suggested Calculation Order" in prompt
+        assert prompt.index("1. Sheet1!B2") < prompt.index("2. Sheet1!B3")
+
+    def test_prompt_flags_cyclic_formulas(self):
+        """Test that circular formulas are reported instead of ordered."""
+        analysis_dict = {
+            "filename": "cycle.xlsx",
+            "sheets": [{
+                "name": "Sheet1",
+                "row_count": 2,
+                "col_count": 1,
+                "used_range": "A1:A2",
+                "input_cells": [],
+                "output_cells": ["A1", "A2"],
+                "formulas": [
+                    {"cell": "A1", "formula": "=A2", "dependencies": ["A2"]},
+                    {"cell": "A2", "formula": "=A1", "dependencies": ["A1"]},
+                ],
+            }],
+            "has_vba": False,
+        }
+        prompt = create_spec_prompt(analysis_dict)
+        assert "Cyclic formulas detected (2): Sheet1!A1, Sheet1!A2\n" in prompt
+
+    def test_prompt_caps_cyclic_formulas(self):
+        """Test that a large cyclic block lists 20 cells plus a count."""
+        formulas = [
+            {"cell": f"A{i}", "formula": f"=A{i % 50 + 1}", "dependencies": [f"A{i % 50 + 1}"]}
+            for i in range(1, 51)
+        ]
+        analysis_dict = {
+            "filename": "big_cycle.xlsx",
+            "sheets": [{
+                "name": "Sheet1",
+                "row_count": 50,
+                "col_count": 1,
+                "used_range": "A1:A50",
+                "input_cells": [],
+                "output_cells": [],
+                "formulas": formulas,
+            }],
+            "has_vba": False,
+        }
+        prompt = create_spec_prompt(analysis_dict)
+        line = next(l for l in prompt.splitlines() if "Cyclic formulas detected" in l)
+        assert line.startswith("## Cyclic formulas detected (50): ")
+        assert line.endswith(", ... and 30 more")
+        assert line.count("Sheet1!") == 20
+
 
 class TestSpecAgentWithFakeModel:
     """Tests for Spec Agent using FakeModel (SDK pattern)."""
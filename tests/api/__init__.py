@@ -0,0 +1 @@
+"""API route unit tests."""
@@ -0,0 +1,182 @@
+"""Unit tests for the conversion API routes (src/api/routes.py).
+
+Covers the in-memory JobStore, upload size limits and the job lifecycle
+driven by run_conversion_async, with the conversion pipeline replaced by a
+stub.
+"""
+
+from __future__ import annotations
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.api import create_app, routes
+from src.api.routes import JobStore, _save_upload
+from src.orchestrator import ConversionProgress
+
+
+def _job(status: str = "pending") -> dict:
+    return {"status": status, "progress": 0.0, "message": "", "result": None}
+
+
+class TestJobStore:
+    """Locked access, snapshots and eviction of the job table."""
+
+    def test_running_jobs_are_never_evicted(self):
+        """Over capacity, only finished jobs are dropped, oldest first."""
+        store = JobStore(max_jobs=2)
+        store["a"] = _job("analyzing")
+        store["b"] = _job("generating")
+        store["c"] = _job("pending")
+
+        # Nothing is finished yet, so the table grows past max_jobs
+        assert len(store) == 3
+
+        store.update("b", status="complete")
+        store.update("a", status="failed")
+        store["d"] = _job("pending")
+
+        # Both finished jobs go; the running ones stay
+        assert "a" not in store
+        assert "b" not in store
+        assert "c" in store
+        assert "d" in store
+
+    def test_eviction_prefers_least_recently_used(self):
+        """A finished job read recently outlives one that was not."""
+        store = JobStore(max_jobs=2)
+        store["old"] = _job("complete")
+        store["new"] = _job("complete")
+        store.get("old")
+        store["next"] = _job("pending")
+
+        assert "old" in store
+        assert "new" not in store
+
+    def test_update_applies_fields(self):
+        """update() changes the stored job and reports whether it exists."""
+        store = JobStore()
+        store["a"] = _job()
+
+        assert store.update("a", status="planning", progress=0.4)
+        assert store.get("a")["status"] == "planning"
+        assert store.get("a")["progress"] == 0.4
+        assert not store.update("missing", status="complete")
+        assert "missing" not in store
+
+    def test_get_returns_a_snapshot(self):
+        """Changing a fetched job does not change the stored one."""
+        store = JobStore()
+        store["a"] = _job()
+        store.get("a")["status"] = "complete"
+
+        assert store.get("a")["status"] == "pending"
+
+
+class TestRunConversion:
+    """Background conversion updates its job through the store."""
+
+    @pytest.fixture
+    def jobs(self, monkeypatch):
+        store = JobStore()
+        monkeypatch.setattr(routes, "conversion_jobs", store)
+        return store
+
+    @pytest.mark.asyncio
+    async def test_progress_and_result_are_recorded(self, jobs, monkeypatch, tmp_path):
+        """Progress callbacks and the final result land in the job."""
+        seen = []
+
+        async def fake_convert(file_path, progress_callback=None, **kwargs):
+            progress_callback(ConversionProgress(stage="planning", message="계획 중", progress=0.4))
+            seen.append(jobs.get("job"))
+            return SimpleNamespace(
+                success=True,
+                app=SimpleNamespace(app_name="견적 계산기", html="<html></html>"),
+                iterations_used=2,
+                final_pass_rate=1.0,
+                message="",
+            )
+
+        monkeypatch.setattr(routes, "convert_excel_to_webapp", fake_convert)
+        upload = tmp_path / "upload" / "견적.xlsx"
+        upload.parent.mkdir()
+        upload.write_bytes(b"PK")
+        jobs["job"] = {**_job(), "file_path": str(upload)}
+
+        await routes.run_conversion_async("job")
+
+        assert seen[0]["status"] == "planning"
+        assert seen[0]["progress"] == 0.4
+        job = jobs.get("job")
+        assert job["status"] == "complete"
+        assert job["result"]["app_name"] == "견적 계산기"
+        assert not upload.parent.exists()
+
+    @pytest.mark.asyncio
+    async def test_deleted_job_is_not_recreated(self, jobs, monkeypatch, tmp_path):
+        """A job deleted mid-conversion stays deleted."""
+
+        async def fake_convert(file_path, progress_callback=None, **kwargs):
+            jobs.pop("job")
+            progress_callback(ConversionProgress(stage="planning", message="계획 중", progress=0.4))
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(routes, "convert_excel_to_webapp", fake_convert)
+        jobs["job"] = {**_job(), "file_path": str(tmp_path / "missing.xlsx")}
+
+        await routes.run_conversion_async("job")
+
+        assert "job" not in jobs
+
+
+class TestUploadLimit:
+    """Uploads over MAX_UPLOAD_BYTES are rejected without leftovers."""
+
+    @pytest.fixture
+    def upload_root(self, monkeypatch, tmp_path):
+        """Create upload temp dirs under tmp_path so leftovers can be checked."""
+        root = tmp_path / "uploads"
+        root.mkdir()
+
+        def mkdtemp():
+            path = root / f"job{len(list(root.iterdir()))}"
+            path.mkdir()
+            return str(path)
+
+        monkeypatch.setattr(routes.tempfile, "mkdtemp", mkdtemp)
+        return root
+
+    def test_oversized_upload_returns_413(self, monkeypatch, upload_root):
+        """The request fails with 413, no job is created and no file remains."""
+        jobs = JobStore()
+        monkeypatch.setattr(routes, "conversion_jobs", jobs)
+        monkeypatch.setattr(routes, "MAX_UPLOAD_BYTES", 100 * 1024)
+        client = TestClient(create_app())
+
+        response = client.post(
+            "/api/v1/convert",
+            files={"file": ("big.xlsx", b"x" * (200 * 1024), "application/octet-stream")},
+        )
+
+        assert response.status_code == 413
+        assert len(jobs) == 0
+        assert list(upload_root.iterdir()) == []
+
+    def test_upload_at_the_limit_is_saved(self, tmp_path):
+        """Exactly max_bytes is accepted and written in full."""
+        dest = tmp_path / "ok.xlsx"
+        _save_upload(io.BytesIO(b"x" * 1000), dest, max_bytes=1000)
+
+        assert dest.read_bytes() == b"x" * 1000
+
+    def test_one_byte_over_is_rejected(self, tmp_path):
+        """max_bytes + 1 raises a 413 HTTPException."""
+        with pytest.raises(HTTPException) as exc_info:
+            _save_upload(io.BytesIO(b"x" * 1001), tmp_path / "big.xlsx", max_bytes=1000)
+
+        assert exc_info.value.status_code == 413
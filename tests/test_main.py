@@ -0,0 +1,199 @@
+"""Unit tests for the CLI entry point (main.py).
+
+Covers the finished-conversion cache (with the pipeline replaced by a stub,
+so no model is called), the argparse-free fast path of the CLI parser and
+the single-worker guard of ``serve``.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+class _StubClient:
+    """Stands in for AsyncOpenAI (no API key or network needed)."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def conversions(monkeypatch, tmp_path):
+    """Redirect the cache to tmp_path and record every pipeline run."""
+    calls = []
+
+    async def fake_convert(excel_path, progress_callback=None, **kwargs):
+        calls.append(excel_path)
+        return SimpleNamespace(
+            success=True,
+            app=SimpleNamespace(html=f"<html><body>run {len(calls)}</body></html>"),
+            iterations_used=1,
+            final_pass_rate=1.0,
+            message="",
+        )
+
+    monkeypatch.setattr(main, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr("src.orchestrator.convert_excel_to_webapp", fake_convert)
+    monkeypatch.setattr("src.agents._client.AsyncOpenAI", _StubClient)
+    monkeypatch.setattr("src.agents._client.set_default_openai_client", lambda client: None)
+    return calls
+
+
+def _workbook(tmp_path, name: str, content: bytes = b"PK fake workbook"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+async def _convert(path, output, **kwargs):
+    await main.convert_file(str(path), str(output), with_trace=False, **kwargs)
+    return output.read_text(encoding="utf-8")
+
+
+class TestConversionCache:
+    """Finished conversions are reused only for identical input and pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_served_from_cache(self, conversions, tmp_path):
+        """A copy of an already converted file skips the pipeline."""
+        first = await _convert(_workbook(tmp_path, "a.xlsx"), tmp_path / "a.html")
+        second = await _convert(_workbook(tmp_path, "b.xlsx"), tmp_path / "b.html")
+
+        assert len(conversions) == 1
+        assert second == first
+
+    @pytest.mark.asyncio
+    async def test_changed_content_misses(self, conversions, tmp_path):
+        """Different workbook bytes run the pipeline again."""
+        await _convert(_workbook(tmp_path, "a.xlsx"), tmp_path / "a.html")
+        html = await _convert(_workbook(tmp_path, "b.xlsx", b"PK other"), tmp_path / "b.html")
+
+        assert len(conversions) == 2
+        assert "run 2" in html
+
+    @pytest.mark.asyncio
+    async def test_iteration_budget_is_part_of_the_key(self, conversions, tmp_path):
+        """The same file with another --iterations value is converted anew."""
+        path = _workbook(tmp_path, "a.xlsx")
+        await _convert(path, tmp_path / "a.html", max_iterations=3)
+        await _convert(path, tmp_path / "b.html", max_iterations=1)
+
+        assert len(conversions) == 2
+
+    @pytest.mark.asyncio
+    async def test_pipeline_change_misses(self, conversions, tmp_path, monkeypatch):
+        """Editing prompts, model names or code invalidates earlier entries."""
+        path = _workbook(tmp_path, "a.xlsx")
+        await _convert(path, tmp_path / "a.html")
+        monkeypatch.setattr(main, "_pipeline_fingerprint", lambda: "0" * 16)
+        await _convert(path, tmp_path / "b.html")
+
+        assert len(conversions) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_cache_always_converts(self, conversions, tmp_path):
+        """--no-cache neither reads nor writes cached results."""
+        path = _workbook(tmp_path, "a.xlsx")
+        await _convert(path, tmp_path / "a.html", use_cache=False)
+        await _convert(path, tmp_path / "b.html", use_cache=False)
+
+        assert len(conversions) == 2
+        assert not (tmp_path / "cache").exists()
+
+    def test_fingerprint_tracks_pipeline_sources(self, tmp_path, monkeypatch):
+        """The fingerprint changes when any agent module changes."""
+        (tmp_path / "agents").mkdir()
+        module = tmp_path / "agents" / "planner_agent.py"
+        module.write_text('MODEL = "gpt-5.2"\n')
+        monkeypatch.setattr(main, "PIPELINE_DIR", tmp_path)
+
+        main._pipeline_fingerprint.cache_clear()
+        before = main._pipeline_fingerprint()
+        module.write_text('MODEL = "gpt-5-mini"\n')
+        main._pipeline_fingerprint.cache_clear()
+        after = main._pipeline_fingerprint()
+        main._pipeline_fingerprint.cache_clear()
+
+        assert before != after
+
+
+class TestFastParse:
+    """_fast_parse agrees with argparse or defers to it."""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["serve"],
+            ["serve", "--host", "127.0.0.1", "--port", "9000"],
+            ["serve", "--port", "-1"],
+            ["serve", "--port", "²"],
+            ["serve", "--port", "80x"],
+            ["serve", "extra"],
+            ["convert", "in.xlsx"],
+            ["convert", "in.xlsx", "-o", "out.html", "-v", "-i", "5", "--no-cache"],
+            ["convert", "-v", "in.xlsx", "--output", "out.html"],
+            ["convert", "in.xlsx", "-o", "-weird.html"],
+            ["convert", "in.xlsx", "--output", "--verbose"],
+            ["convert", "in.xlsx", "-o"],
+            ["convert", "in.xlsx", "-i", "-2"],
+            ["convert", "in.xlsx", "--output=out.html"],
+            ["convert", "in.xlsx", "-oout.html"],
+            ["convert", "in.xlsx", "--out", "out.html"],
+            ["convert", "--", "-in.xlsx"],
+            ["convert", "a.xlsx", "b.xlsx"],
+            ["convert"],
+            ["convert", "-h"],
+            ["bogus"],
+            [],
+        ],
+    )
+    def test_matches_argparse(self, argv):
+        """Accepted argv parse exactly as argparse would; the rest returns None."""
+        fast = main._fast_parse(argv)
+        try:
+            expected = main._build_parser().parse_args(argv)
+        except SystemExit:
+            expected = None
+
+        if fast is not None:
+            assert expected is not None, f"argparse rejects {argv}"
+            assert vars(fast) == vars(expected)
+
+
+class TestRunApi:
+    """serve refuses configurations the in-memory job store cannot support."""
+
+    @pytest.fixture
+    def served(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr("uvicorn.run", lambda app, **kwargs: calls.append(kwargs))
+        return calls
+
+    @pytest.mark.parametrize("value", ["", "1", " 1 "])
+    def test_single_worker_starts(self, monkeypatch, served, value):
+        """Unset, empty or 1 runs one uvicorn server."""
+        monkeypatch.setenv("WEB_CONCURRENCY", value)
+        main.run_api(host="127.0.0.1", port=9000)
+
+        assert served == [{"host": "127.0.0.1", "port": 9000}]
+
+    @pytest.mark.parametrize(
+        ("value", "message"),
+        [("4", "not supported"), ("two", "must be an integer"), ("1.5", "must be an integer")],
+    )
+    def test_bad_worker_count_exits_cleanly(self, monkeypatch, capsys, served, value, message):
+        """Several workers or a malformed value print an error instead of a traceback."""
+        monkeypatch.setenv("WEB_CONCURRENCY", value)
+        with pytest.raises(SystemExit) as exc_info:
+            main.run_api()
+
+        assert exc_info.value.code == 1
+        assert message in capsys.readouterr().out
+        assert served == []
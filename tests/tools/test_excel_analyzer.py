@@ -0,0 +1,219 @@
+"""Unit tests for the Excel analyzer tools."""
+
+from __future__ import annotations
+
+import re
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from src.tools import excel_analyzer
+from src.tools.excel_analyzer import (
+    analyze_excel_file,
+    get_cell_data,
+    workbook_cache_disabled,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_workbook_cache():
+    """Close and drop pinned workbooks between tests."""
+    yield
+    with excel_analyzer._WB_CACHE_LOCK:
+        for wb in excel_analyzer._WB_CACHE.values():
+            wb.close()
+        excel_analyzer._WB_CACHE.clear()
+
+
+def _save_workbook(path, value):
+    wb = Workbook()
+    wb.active["A1"] = value
+    wb.active["B1"] = "=A1*2"
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def print_layout_workbook(tmp_path):
+    """Workbook with a print area, landscape A3 page setup, margins and header."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "견적서"
+    ws["A1"] = 100
+    ws["B1"] = "=A1*2"
+    ws.print_area = "A1:D20"
+    ws.page_setup.orientation = "landscape"
+    ws.page_setup.paperSize = 8  # A3
+    ws.page_setup.scale = 80
+    ws.page_margins.top = 1.2
+    ws.oddHeader.center.text = "견적서"
+    wb.create_sheet("Notes")["A1"] = "memo"
+
+    path = tmp_path / "layout.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def stale_dimension_workbook(tmp_path):
+    """Workbook whose stored <dimension> claims A1:A1 but data reaches D7."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Calc"
+    ws["B3"] = 1
+    ws["C3"] = 2
+    ws["D7"] = "=B3+C3"
+
+    src = tmp_path / "source.xlsx"
+    wb.save(src)
+
+    path = tmp_path / "stale.xlsx"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(path, "w") as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1:A1"', data)
+            zout.writestr(item, data)
+    return path
+
+
+@pytest.fixture
+def multi_sheet_workbook(tmp_path):
+    """Three sheets with inputs and formulas."""
+    wb = Workbook()
+    for index, title in enumerate(["입력", "계산", "요약"]):
+        ws = wb.active if index == 0 else wb.create_sheet()
+        ws.title = title
+        for row in range(1, 30):
+            ws.cell(row, 1, row * (index + 1))
+            ws.cell(row, 2, f"=A{row}*{index + 2}")
+        ws["C1"] = "=SUM(B1:B29)"
+
+    path = tmp_path / "multi.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def parallel_pool(monkeypatch):
+    """Allow a two-worker sheet pool on any host and shut it down afterwards."""
+    monkeypatch.setattr(excel_analyzer.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(excel_analyzer, "_SHEET_POOL", None)
+    yield
+    if excel_analyzer._SHEET_POOL is not None:
+        excel_analyzer._SHEET_POOL.shutdown()
+
+
+class TestPrintSettings:
+    """Print metadata must survive read-only workbook loading."""
+
+    def test_print_area_is_detected(self, print_layout_workbook):
+        """Test that the sheet print area is reported."""
+        analysis = analyze_excel_file(str(print_layout_workbook))
+        sheet = analysis.sheets[0]
+        assert sheet.has_print_area is True
+        assert sheet.print_area == "'견적서'!$A$1:$D$20"
+        assert analysis.sheets[1].has_print_area is False
+
+    def test_page_setup_is_extracted(self, print_layout_workbook):
+        """Test that orientation, paper size, scale, margins and header are read."""
+        settings = analyze_excel_file(str(print_layout_workbook)).print_settings
+        assert settings.orientation == "landscape"
+        assert settings.paper_size == "A3"
+        assert settings.scale == 80
+        assert settings.margins["top"] == pytest.approx(1.2)
+        assert settings.header == "견적서"
+
+
+class TestSheetDimensions:
+    """Used ranges come from the cells, not the stored dimension tag."""
+
+    def test_stale_dimension_is_ignored(self, stale_dimension_workbook):
+        """Test that a wrong <dimension> does not truncate the analysis."""
+        sheet = analyze_excel_file(str(stale_dimension_workbook)).sheets[0]
+        assert sheet.used_range == "B3:D7"
+        assert sheet.row_count == 7
+        assert [f.cell for f in sheet.formulas] == ["D7"]
+        assert sorted(sheet.input_cells) == ["B3", "C3"]
+
+    def test_stale_dimension_does_not_truncate_cell_data(self, stale_dimension_workbook):
+        """Test that get_cell_data returns cells outside the stored dimension."""
+        cells = get_cell_data(str(stale_dimension_workbook))
+        assert sorted(cells) == ["B3", "C3", "D7"]
+
+
+class TestWorkbookCache:
+    """Pinned read-only workbook handles."""
+
+    def test_repeat_calls_reuse_the_pinned_workbook(self, tmp_path):
+        """Test that analysis and cell reads share one open handle."""
+        path = _save_workbook(tmp_path / "book.xlsx", 1)
+        analyze_excel_file(str(path))
+        get_cell_data(str(path))
+        assert len(excel_analyzer._WB_CACHE) == 1
+
+    def test_rewritten_file_is_reloaded(self, tmp_path):
+        """Test that a file replaced at the same path is not served stale."""
+        path = _save_workbook(tmp_path / "book.xlsx", 1)
+        assert get_cell_data(str(path))["A1"].value == 1
+
+        _save_workbook(tmp_path / "replacement.xlsx", "새 값").replace(path)
+        assert get_cell_data(str(path))["A1"].value == "새 값"
+
+    def test_evicted_workbooks_are_closed(self, tmp_path, monkeypatch):
+        """Test that the least recently used handle is closed on eviction."""
+        monkeypatch.setattr(excel_analyzer, "WORKBOOK_CACHE_SIZE", 1)
+        first = _save_workbook(tmp_path / "first.xlsx", 1)
+        second = _save_workbook(tmp_path / "second.xlsx", 2)
+
+        get_cell_data(str(first))
+        (first_wb,) = excel_analyzer._WB_CACHE.values()
+        get_cell_data(str(second))
+
+        assert len(excel_analyzer._WB_CACHE) == 1
+        assert first_wb._archive.fp is None
+
+    def test_disabled_cache_pins_nothing(self, tmp_path):
+        """Test that workbook_cache_disabled opens and closes per call."""
+        path = _save_workbook(tmp_path / "upload.xlsx", 1)
+        with workbook_cache_disabled():
+            analysis = analyze_excel_file(str(path))
+            cells = get_cell_data(str(path))
+
+        assert analysis.total_formulas == 1
+        assert cells["B1"].formula == "=A1*2"
+        assert not excel_analyzer._WB_CACHE
+
+
+class TestParallelSheetAnalysis:
+    """Process-pool sheet analysis for large workbooks."""
+
+    def test_parallel_matches_serial(self, multi_sheet_workbook, parallel_pool, monkeypatch):
+        """Test that fanning sheets out to processes gives the serial result."""
+        serial = analyze_excel_file(str(multi_sheet_workbook))
+
+        calls = []
+        parallel_fn = excel_analyzer._analyze_sheets_parallel
+
+        def spy(file_path, sheet_names):
+            result = parallel_fn(file_path, sheet_names)
+            calls.append(result is not None)
+            return result
+
+        monkeypatch.setattr(excel_analyzer, "PARALLEL_MIN_SHEET_BYTES", 0)
+        monkeypatch.setattr(excel_analyzer, "_analyze_sheets_parallel", spy)
+        parallel = analyze_excel_file(str(multi_sheet_workbook))
+
+        assert calls == [True]
+        assert parallel.model_dump() == serial.model_dump()
+
+    def test_small_workbook_stays_serial(self, multi_sheet_workbook, monkeypatch):
+        """Test that workbooks below the size threshold never start the pool."""
+        def fail(*args):
+            raise AssertionError("small workbook sent to the process pool")
+
+        monkeypatch.setattr(excel_analyzer, "_analyze_sheets_parallel", fail)
+        analysis = analyze_excel_file(str(multi_sheet_workbook))
+        assert len(analysis.sheets) == 3
+        assert analysis.total_formulas == 3 * 30